@@ -4,13 +4,36 @@ Application configuration using Pydantic Settings.
 Loads environment variables from .env file and provides typed configuration.
 """
 
-from functools import lru_cache
+from functools import cached_property, lru_cache
 from pathlib import Path
 from typing import Optional
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
+class IntegrationSettings(BaseSettings):
+    """
+    Optional API keys for future features.
+
+    Kept separate from Settings so deployments that don't use these
+    integrations never load them; access via `settings.integrations`.
+    """
+
+    google_api_key: Optional[str] = None
+    anthropic_api_key: Optional[str] = None
+    clerk_secret_key: Optional[str] = None
+    clerk_webhook_secret: Optional[str] = None
+    stripe_secret_key: Optional[str] = None
+    stripe_publishable_key: Optional[str] = None
+
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        case_sensitive=False,
+        extra="ignore"
+    )
+
+
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
 
@@ -29,12 +52,16 @@ class Settings(BaseSettings):
 
     # Database
     database_url: str = "sqlite+aiosqlite:///./data/chatbots.db"
+    database_pool_pre_ping: Optional[bool] = None  # Default: off for SQLite, on otherwise
 
     # Qdrant Vector Database
     qdrant_path: str = "./data/qdrant"  # Local mode path
     qdrant_url: Optional[str] = None  # Server mode URL (overrides path if set)
     qdrant_api_key: Optional[str] = None  # For Qdrant Cloud or secured instances
 
+    # Redis (shared chat rate limits across workers; in-process if unset)
+    redis_url: Optional[str] = None
+
     # File Storage
     upload_path: str = "./data/uploads"
     avatar_max_size_kb: int = 500
@@ -55,14 +82,6 @@ class Settings(BaseSettings):
     # Logging
     log_level: str = "INFO"
 
-    # Optional API Keys (for future features)
-    google_api_key: Optional[str] = None
-    anthropic_api_key: Optional[str] = None
-    clerk_secret_key: Optional[str] = None
-    clerk_webhook_secret: Optional[str] = None
-    stripe_secret_key: Optional[str] = None
-    stripe_publishable_key: Optional[str] = None
-
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -70,29 +89,44 @@ class Settings(BaseSettings):
         extra="ignore"
     )
 
-    @property
+    @cached_property
+    def integrations(self) -> IntegrationSettings:
+        """Optional integration settings, loaded on first access."""
+        return IntegrationSettings()
+
+    @cached_property
     def cors_origins_list(self) -> list[str]:
         """Parse CORS origins from comma-separated string."""
         if self.cors_origins == "*":
             return ["*"]
         return [origin.strip() for origin in self.cors_origins.split(",")]
 
-    @property
+    @cached_property
+    def is_sqlite(self) -> bool:
+        """Check if the database is SQLite (local file, no network)."""
+        return self.database_url.startswith("sqlite")
+
+    @cached_property
     def use_qdrant_server(self) -> bool:
         """Check if Qdrant server mode should be used."""
         return self.qdrant_url is not None
 
+    @cached_property
+    def avatar_dir(self) -> Path:
+        """Directory holding processed bot avatar images."""
+        return Path(self.upload_path) / "avatars"
+
     def ensure_data_directories(self) -> None:
         """Create data directories if they don't exist."""
         Path("./data").mkdir(exist_ok=True)
         Path(self.upload_path).mkdir(parents=True, exist_ok=True)
-        Path(f"{self.upload_path}/avatars").mkdir(parents=True, exist_ok=True)
+        self.avatar_dir.mkdir(parents=True, exist_ok=True)
 
         if not self.use_qdrant_server:
             Path(self.qdrant_path).mkdir(parents=True, exist_ok=True)
 
 
-@lru_cache
+@lru_cache(maxsize=None)
 def get_settings() -> Settings:
     """
     Get cached settings instance.
@@ -100,3 +134,8 @@ def get_settings() -> Settings:
     Uses lru_cache to ensure settings are only loaded once.
     """
     return Settings()
+
+
+# Eagerly loaded settings for module-level imports (avoids a cache lookup
+# on every access in request handlers)
+settings: Settings = get_settings()
@@ -6,21 +6,65 @@ Provides async SQLAlchemy engine and session for database operations.
 
 from typing import AsyncGenerator
 
+from sqlalchemy import Uuid, event
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.orm import declarative_base
-
-from app.config import get_settings
-
-settings = get_settings()
+from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.config import settings
+
+# Connection pool configuration
+POOL_SIZE = 20  # Persistent connections kept open
+MAX_OVERFLOW = 40  # Extra connections allowed under burst load
+POOL_TIMEOUT = 30  # Seconds to wait for a free connection
+POOL_RECYCLE = 300  # Recycle connections after 5 minutes
+QUERY_CACHE_SIZE = 1200  # Compiled SQL cache entries (default 500)
+
+# PRAGMA user_version once dashed legacy UUID keys have been rewritten
+UUID_KEYS_SCHEMA_VERSION = 1
+
+# SQLite tuning applied to every new connection
+SQLITE_PRAGMAS = (
+    "PRAGMA foreign_keys=ON",  # Enforce ON DELETE CASCADE (off by default)
+    "PRAGMA journal_mode=WAL",  # Readers don't block writers
+    "PRAGMA synchronous=NORMAL",  # Safe with WAL, far fewer fsyncs
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",  # 256MB memory-mapped I/O
+    "PRAGMA cache_size=-64000",  # 64MB page cache (negative = KiB)
+)
 
 # Create async engine
 engine = create_async_engine(
     settings.database_url,
     echo=settings.debug,  # Log SQL queries in debug mode
     future=True,
-    pool_pre_ping=True,  # Verify connections before using
+    poolclass=AsyncAdaptedQueuePool,
+    pool_size=POOL_SIZE,
+    max_overflow=MAX_OVERFLOW,
+    pool_timeout=POOL_TIMEOUT,
+    # SQLite has no server-side idle timeout, so never recycle its connections
+    pool_recycle=-1 if settings.is_sqlite else POOL_RECYCLE,
+    pool_use_lifo=True,  # Reuse the most recent (warmest) connection first
+    query_cache_size=QUERY_CACHE_SIZE,
+    # Verify connections before using; pure overhead for local SQLite files
+    pool_pre_ping=(
+        settings.database_pool_pre_ping
+        if settings.database_pool_pre_ping is not None
+        else not settings.is_sqlite
+    ),
 )
 
+
+if settings.is_sqlite:
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+        """Apply SQLite PRAGMAs when the pool opens a new raw connection."""
+        cursor = dbapi_connection.cursor()
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+        cursor.close()
+
 # Create async session factory
 AsyncSessionLocal = async_sessionmaker(
     engine,
@@ -30,8 +74,10 @@ AsyncSessionLocal = async_sessionmaker(
     autoflush=False,
 )
 
-# Base class for ORM models
-Base = declarative_base()
+class Base(DeclarativeBase):
+    """Base class for ORM models."""
+
+    pass
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
@@ -45,11 +91,22 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
 
     Yields:
         AsyncSession: Database session
+
+    Note:
+        Only commits when the session holds pending ORM changes. Read-only
+        requests end with a rollback, which releases the connection without
+        a COMMIT (and the fsync it costs on SQLite). Routes issuing Core
+        UPDATE/DELETE statements must commit explicitly.
     """
     async with AsyncSessionLocal() as session:
         try:
             yield session
-            await session.commit()
+            if session.in_transaction() and (
+                session.new or session.dirty or session.deleted
+            ):
+                await session.commit()
+            else:
+                await session.rollback()
         except Exception:
             await session.rollback()
             raise
@@ -70,6 +127,66 @@ async def init_db() -> None:
         # Create all tables
         await conn.run_sync(Base.metadata.create_all)
 
+        # create_all skips indexes on tables that already exist, so add any
+        # indexes introduced after the database was first created
+        await conn.run_sync(_create_missing_indexes)
+
+        if settings.is_sqlite:
+            # Refresh query planner statistics
+            await conn.exec_driver_sql("PRAGMA optimize")
+
+    if settings.is_sqlite:
+        # Convert dashed UUID strings written by older versions
+        await _normalize_legacy_uuids()
+
+
+def _create_missing_indexes(sync_conn) -> None:
+    """Create indexes declared on the models but missing from the database."""
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(sync_conn, checkfirst=True)
+
+
+async def _normalize_legacy_uuids() -> None:
+    """
+    Rewrite dashed UUID strings into the 32-char hex form Uuid columns use.
+
+    Earlier versions stored UUID keys as 36-char strings; without this
+    rewrite they would no longer match lookups on SQLite.
+
+    Parent keys and the foreign keys pointing at them are rewritten by
+    separate UPDATEs, so this runs on its own connection with foreign key
+    enforcement off (it can only be toggled outside a transaction).
+
+    Runs once per database: completion is recorded in PRAGMA user_version
+    so later startups skip the full-table scans.
+    """
+    async with engine.connect() as conn:
+        result = await conn.exec_driver_sql("PRAGMA user_version")
+        if result.scalar() >= UUID_KEYS_SCHEMA_VERSION:
+            return
+
+        await conn.exec_driver_sql("PRAGMA foreign_keys=OFF")
+        try:
+            await conn.run_sync(_rewrite_dashed_uuids)
+            await conn.exec_driver_sql(
+                f"PRAGMA user_version = {UUID_KEYS_SCHEMA_VERSION}"
+            )
+            await conn.commit()
+        finally:
+            await conn.exec_driver_sql("PRAGMA foreign_keys=ON")
+
+
+def _rewrite_dashed_uuids(sync_conn) -> None:
+    """Strip the dashes from every Uuid column value that has them."""
+    for table in Base.metadata.sorted_tables:
+        for column in table.columns:
+            if isinstance(column.type, Uuid):
+                sync_conn.exec_driver_sql(
+                    f"UPDATE {table.name} SET {column.name} = "
+                    f"REPLACE({column.name}, '-', '') WHERE {column.name} LIKE '%-%'"
+                )
+
 
 async def close_db() -> None:
     """
@@ -4,7 +4,9 @@ FastAPI dependencies for authentication and database access.
 Provides reusable dependencies that can be injected into route handlers.
 """
 
-from typing import Optional
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Optional
 
 from fastapi import Cookie, Depends, Header, HTTPException, status
 from sqlalchemy import select
@@ -14,6 +16,77 @@ from app.database import get_db
 from app.models import AdminSession, Bot
 from app.services.auth_service import get_session_by_token
 
+# Bot-by-API-key cache configuration
+BOT_CACHE_TTL = 60  # seconds
+BOT_CACHE_MAX_SIZE = 1024  # entries
+
+
+class BotAuthInfo(NamedTuple):
+    """Bot columns needed to authenticate widget and chat requests."""
+
+    id: str
+    api_key: str
+    message_count: int
+    message_limit: int
+    name: str
+
+
+# api_key -> (expires_at monotonic timestamp, BotAuthInfo)
+_bot_cache: OrderedDict[str, tuple[float, BotAuthInfo]] = OrderedDict()
+
+
+def get_cached_bot(api_key: str) -> Optional[BotAuthInfo]:
+    """
+    Get a bot from the API key cache if present and not expired.
+
+    Args:
+        api_key: Bot API key
+
+    Returns:
+        Cached BotAuthInfo, or None on cache miss
+    """
+    entry = _bot_cache.get(api_key)
+    if entry is None:
+        return None
+
+    expires_at, bot = entry
+    if expires_at < time.monotonic():
+        _bot_cache.pop(api_key, None)
+        return None
+
+    _bot_cache.move_to_end(api_key)
+    return bot
+
+
+def cache_bot(bot: BotAuthInfo) -> None:
+    """
+    Store a bot in the API key cache.
+
+    Args:
+        bot: Bot auth info to cache
+    """
+    _bot_cache[bot.api_key] = (time.monotonic() + BOT_CACHE_TTL, bot)
+    _bot_cache.move_to_end(bot.api_key)
+
+    while len(_bot_cache) > BOT_CACHE_MAX_SIZE:
+        _bot_cache.popitem(last=False)
+
+
+def invalidate_bot_cache(api_key: Optional[str] = None) -> None:
+    """
+    Drop a bot from the API key cache.
+
+    Must be called whenever a bot is updated or deleted so widgets
+    don't keep seeing stale configuration.
+
+    Args:
+        api_key: API key to invalidate, or None to clear the whole cache
+    """
+    if api_key is None:
+        _bot_cache.clear()
+    else:
+        _bot_cache.pop(api_key, None)
+
 
 async def get_current_admin(
     session_token: Optional[str] = Cookie(None), db: AsyncSession = Depends(get_db)
@@ -76,18 +149,21 @@ async def get_current_admin_optional(
 async def validate_bot_api_key(
     x_api_key: str = Header(..., alias="X-API-Key"),
     db: AsyncSession = Depends(get_db),
-) -> Bot:
+) -> BotAuthInfo:
     """
     Validate bot API key from X-API-Key header.
 
-    Used by widget endpoints to authenticate requests.
+    Used by widget endpoints to authenticate requests. Only the columns
+    needed for auth are loaded (no ORM instance), and results are cached
+    per API key for BOT_CACHE_TTL seconds. Routes that need the full Bot
+    should fetch it by id.
 
     Args:
         x_api_key: API key from X-API-Key header
         db: Database session
 
     Returns:
-        Bot object if API key is valid
+        BotAuthInfo if API key is valid
 
     Raises:
         HTTPException: 401 if API key is missing or invalid
@@ -98,14 +174,25 @@ async def validate_bot_api_key(
             detail="API key required. Include X-API-Key header.",
         )
 
-    # Look up bot by API key
-    result = await db.execute(select(Bot).where(Bot.api_key == x_api_key))
-    bot = result.scalar_one_or_none()
+    bot = get_cached_bot(x_api_key)
+    if bot:
+        return bot
 
-    if not bot:
+    # Look up bot by API key
+    result = await db.execute(
+        select(Bot.id, Bot.api_key, Bot.message_count, Bot.message_limit, Bot.name)
+        .where(Bot.api_key == x_api_key)
+        .limit(1)
+    )
+    row = result.first()
+
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid API key",
         )
 
+    bot = BotAuthInfo(*row)
+    cache_bot(bot)
+
     return bot
@@ -5,15 +5,22 @@ This module initializes the FastAPI app, sets up CORS middleware,
 and mounts all API routes.
 """
 
+import asyncio
 import logging
+import time
 from contextlib import asynccontextmanager
-from datetime import datetime
+from datetime import UTC, datetime
+from typing import Awaitable
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
 
-from app.config import get_settings
+from app.config import settings
+from app.routes import admin, auth, chat, public
+from app.routes.admin import AVATAR_DIR
+from app.routes.auth import ADMIN_CREDENTIALS
+from app.schemas import HealthResponse
+from app.services.auth_service import hash_password, run_session_cleanup
 
 # Configure logging
 logging.basicConfig(
@@ -22,6 +29,44 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Health check caching (probes can hit /api/health several times a second)
+HEALTH_CACHE_TTL = 2.0  # seconds
+_health_cache: dict = {"checked_at": 0.0, "qdrant": None}
+_health_lock = asyncio.Lock()
+
+
+async def _run_startup_step(description: str, step: Awaitable[None]) -> None:
+    """
+    Await a startup step, logging failures with the step's description.
+
+    Args:
+        description: Human-readable step name used in log messages
+        step: Awaitable performing the step
+    """
+    try:
+        await step
+        logger.info(f"{description} completed successfully")
+    except Exception as e:
+        logger.error(f"{description} failed: {e}")
+        raise
+
+
+async def _init_admin_credentials() -> None:
+    """
+    Hash the admin password unless credentials survived a reload.
+
+    bcrypt is CPU-bound, so hashing runs in a worker thread to keep the
+    event loop free for the other startup steps.
+    """
+    if ADMIN_CREDENTIALS["password_hash"] is not None:
+        logger.info("Admin credentials already initialized")
+        return
+
+    ADMIN_CREDENTIALS["password_hash"] = await asyncio.to_thread(
+        hash_password, settings.admin_password
+    )
+    logger.info(f"Admin user initialized: {settings.admin_username}")
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -32,52 +77,55 @@ async def lifespan(app: FastAPI):
     - Creating data directories
     - Database initialization (Phase 1.2)
     - Creating admin user (Phase 1.3)
+    - Qdrant collection initialization (Phase 3.1)
+
+    The database, admin user and Qdrant steps are independent, so they
+    run concurrently.
     """
     from app.database import init_db, close_db
+    from app.services.qdrant_client import init_collection
 
-    settings = get_settings()
     logger.info(f"Starting {settings.app_name} v{settings.app_version}")
 
     # Create necessary directories
     settings.ensure_data_directories()
     logger.info("Data directories initialized")
 
-    # Initialize database (create tables)
-    try:
-        await init_db()
-        logger.info("Database initialized successfully")
-    except Exception as e:
-        logger.error(f"Failed to initialize database: {e}")
-        raise
+    # Map bot ids to avatar files for the legacy avatar route
+    from app.services.avatar_index import build_index
 
-    # Create admin user on startup (Phase 1.3)
-    try:
-        from app.routes.auth import ADMIN_CREDENTIALS
-        from app.services.auth_service import hash_password
-
-        if ADMIN_CREDENTIALS["password_hash"] is None:
-            ADMIN_CREDENTIALS["password_hash"] = hash_password(settings.admin_password)
-            logger.info(f"Admin user initialized: {settings.admin_username}")
-        else:
-            logger.info("Admin credentials already initialized")
-    except Exception as e:
-        logger.error(f"Failed to initialize admin user: {e}")
-        raise
+    await asyncio.to_thread(build_index)
 
-    # Initialize Qdrant collection (Phase 3.1)
-    try:
-        from app.services.qdrant_client import init_collection
+    await asyncio.gather(
+        _run_startup_step("Database initialization", init_db()),
+        _run_startup_step("Admin user initialization", _init_admin_credentials()),
+        _run_startup_step("Qdrant collection initialization", init_collection()),
+    )
 
-        await init_collection()
-        logger.info("Qdrant collection initialized successfully")
-    except Exception as e:
-        logger.error(f"Failed to initialize Qdrant collection: {e}")
-        raise
+    # Flush buffered bot message counts periodically
+    from app.services.usage_counter import flush_message_counts, run_flusher
+
+    flusher = asyncio.create_task(run_flusher())
+
+    # Delete expired admin sessions in the background (lookups skip them)
+    session_cleanup = asyncio.create_task(run_session_cleanup())
+
+    # In-process rate limit windows need pruning when Redis isn't used
+    sweeper = None
+    if not settings.redis_url:
+        from app.services.rate_limiter import run_sweeper
+
+        sweeper = asyncio.create_task(run_sweeper())
 
     yield
 
     # Cleanup on shutdown
     logger.info("Shutting down application")
+    if sweeper is not None:
+        sweeper.cancel()
+    session_cleanup.cancel()
+    flusher.cancel()
+    await flush_message_counts()
     await close_db()
     logger.info("Database connections closed")
 
@@ -86,6 +134,16 @@ async def lifespan(app: FastAPI):
 
     await close_client()
 
+    # Close Redis client (if rate limiting used it)
+    from app.services.rate_limiter import close_client as close_rate_limiter
+
+    await close_rate_limiter()
+
+    # Close scraper HTTP client (if an ingest used it)
+    from app.services.scraper import close_http_client
+
+    await close_http_client()
+
 
 # Create FastAPI app
 app = FastAPI(
@@ -141,7 +199,6 @@ Open-source, self-hostable AI chatbot widget with RAG (Retrieval-Augmented Gener
 )
 
 # Configure CORS
-settings = get_settings()
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.cors_origins_list,
@@ -151,40 +208,64 @@ app.add_middleware(
 )
 
 
-# Health check endpoint
-@app.get("/api/health", tags=["Health"])
-async def health_check():
+async def _get_qdrant_status() -> dict:
     """
-    Health check endpoint.
+    Get Qdrant health status, reusing the last result for HEALTH_CACHE_TTL.
 
     Returns:
-        JSON response with service status, timestamp, and component health
+        Qdrant health status dict
     """
     from app.services.qdrant_client import health_check as qdrant_health
 
-    # Check Qdrant health
-    qdrant_status = await qdrant_health()
+    if time.monotonic() - _health_cache["checked_at"] < HEALTH_CACHE_TTL:
+        return _health_cache["qdrant"]
+
+    async with _health_lock:
+        # Another request may have refreshed the cache while we waited
+        if time.monotonic() - _health_cache["checked_at"] < HEALTH_CACHE_TTL:
+            return _health_cache["qdrant"]
+
+        _health_cache["qdrant"] = await qdrant_health()
+        _health_cache["checked_at"] = time.monotonic()
+
+    return _health_cache["qdrant"]
+
+
+# Health check endpoint
+@app.get("/api/health", response_model=HealthResponse, tags=["Health"])
+async def health_check(response: Response):
+    """
+    Health check endpoint.
+
+    Args:
+        response: FastAPI response object (for setting headers)
+
+    Returns:
+        HealthResponse with service status, timestamp, and component health
+    """
+    # Check Qdrant health (cached briefly to absorb probe traffic)
+    qdrant_status = await _get_qdrant_status()
 
     # Overall health is healthy only if all components are healthy
     overall_healthy = qdrant_status.get("healthy", False)
 
-    return JSONResponse(
-        content={
-            "status": "healthy" if overall_healthy else "unhealthy",
-            "service": "chirp-api",
-            "version": "0.1.0",
-            "timestamp": datetime.utcnow().isoformat(),
-            "components": {
-                "database": "healthy",  # SQLite is always available if app started
-                "qdrant": qdrant_status,
-            },
-        }
+    response.headers["Cache-Control"] = "no-store"
+
+    return HealthResponse(
+        status="healthy" if overall_healthy else "unhealthy",
+        service="chirp-api",
+        version="0.1.0",
+        timestamp=datetime.now(UTC).isoformat(),
+        components={
+            "database": "healthy",  # SQLite is always available if app started
+            "qdrant": qdrant_status,
+        },
     )
 
 
 # Root endpoint
 @app.get("/", tags=["Root"])
-async def root():
+async def root() -> dict[str, str]:
     """
     Root endpoint with API information.
     """
@@ -197,19 +278,22 @@ async def root():
 
 
 # Phase 1.3: Mount auth routes
-from app.routes import auth
 app.include_router(auth.router, prefix="/api/auth", tags=["Authentication"])
 
 # Phase 2.1: Mount admin routes
-from app.routes import admin
 app.include_router(admin.router, prefix="/api/admin", tags=["Admin"])
 
 # Phase 2.2: Mount public routes
-from app.routes import public
 app.include_router(public.router, prefix="/api/public", tags=["Public"])
 
+# Serve uploaded avatars as static files (directory is created at startup)
+app.mount(
+    "/api/public/avatars",
+    public.AvatarStaticFiles(directory=AVATAR_DIR, check_dir=False),
+    name="avatars",
+)
+
 # Phase 5: Mount chat routes
-from app.routes import chat
 app.include_router(chat.router, prefix="/api", tags=["Chat"])
 
 
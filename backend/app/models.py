@@ -12,14 +12,35 @@ import uuid
 from datetime import datetime
 from typing import List
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, String, Text, Index
+from sqlalchemy import (
+    Boolean,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    Uuid,
+    func,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
 
 
+# UUID primary/foreign keys: stored as native 16-byte UUIDs where supported
+# (32-char hex on SQLite), exposed to Python as canonical strings
+UUIDType = Uuid(as_uuid=False)
+
+
 def generate_uuid() -> str:
-    """Generate a UUID string for primary keys."""
+    """
+    Generate a UUID string for primary keys.
+
+    Uses the canonical dashed form (not uuid4().hex) because that is what
+    UUIDType returns on load; a hex default would leave freshly created
+    objects with a different id string than the same row read back.
+    """
     return str(uuid.uuid4())
 
 
@@ -34,7 +55,7 @@ class Bot(Base):
     __tablename__ = "bots"
 
     # Primary Key
-    id: Mapped[str] = mapped_column(String, primary_key=True, default=generate_uuid)
+    id: Mapped[str] = mapped_column(UUIDType, primary_key=True, default=generate_uuid)
 
     # Basic Info
     name: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -64,10 +85,13 @@ class Bot(Base):
     message_count: Mapped[int] = mapped_column(Integer, default=0)
     message_limit: Mapped[int] = mapped_column(Integer, default=1000)
 
-    # Timestamps
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    # Timestamps (default= keeps NOT NULL columns filled on databases
+    # created before the server defaults existed)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=func.now(), server_default=func.now()
+    )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+        DateTime, default=func.now(), server_default=func.now(), onupdate=func.now()
     )
 
     # Relationships
@@ -75,10 +99,17 @@ class Bot(Base):
         "Conversation", back_populates="bot", cascade="all, delete-orphan"
     )
 
+    # Fetch server-generated timestamps via RETURNING on INSERT/UPDATE
+    __mapper_args__ = {"eager_defaults": True}
+
     def __repr__(self) -> str:
         return f"<Bot(id={self.id}, name={self.name})>"
 
 
+# Admin bot list is ordered newest first
+Index("idx_bots_created_at", Bot.created_at.desc())
+
+
 class Conversation(Base):
     """
     Conversation/session model.
@@ -89,20 +120,22 @@ class Conversation(Base):
     __tablename__ = "conversations"
 
     # Primary Key
-    id: Mapped[str] = mapped_column(String, primary_key=True, default=generate_uuid)
+    id: Mapped[str] = mapped_column(UUIDType, primary_key=True, default=generate_uuid)
 
     # Foreign Keys
     bot_id: Mapped[str] = mapped_column(
-        String, ForeignKey("bots.id", ondelete="CASCADE"), nullable=False, index=True
+        UUIDType, ForeignKey("bots.id", ondelete="CASCADE"), nullable=False, index=True
     )
 
     # Session tracking (from widget localStorage)
     session_id: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
 
     # Timestamps
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=func.now(), server_default=func.now()
+    )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+        DateTime, default=func.now(), server_default=func.now(), onupdate=func.now()
     )
 
     # Relationships
@@ -111,6 +144,9 @@ class Conversation(Base):
         "Message", back_populates="conversation", cascade="all, delete-orphan"
     )
 
+    # Fetch server-generated timestamps via RETURNING on INSERT/UPDATE
+    __mapper_args__ = {"eager_defaults": True}
+
     def __repr__(self) -> str:
         return f"<Conversation(id={self.id}, bot_id={self.bot_id}, session_id={self.session_id})>"
 
@@ -129,11 +165,11 @@ class Message(Base):
     __tablename__ = "messages"
 
     # Primary Key
-    id: Mapped[str] = mapped_column(String, primary_key=True, default=generate_uuid)
+    id: Mapped[str] = mapped_column(UUIDType, primary_key=True, default=generate_uuid)
 
     # Foreign Keys
     conversation_id: Mapped[str] = mapped_column(
-        String,
+        UUIDType,
         ForeignKey("conversations.id", ondelete="CASCADE"),
         nullable=False,
         index=True,
@@ -143,7 +179,8 @@ class Message(Base):
     role: Mapped[str] = mapped_column(String(20), nullable=False)  # 'user' or 'assistant'
     content: Mapped[str] = mapped_column(Text, nullable=False)
 
-    # Timestamp
+    # Timestamp (Python-side: history ordering needs sub-second precision,
+    # which CURRENT_TIMESTAMP doesn't provide on SQLite)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
     # Relationships
@@ -155,6 +192,12 @@ class Message(Base):
         return f"<Message(id={self.id}, role={self.role})>"
 
 
+# Composite index for "latest N messages in conversation" queries
+Index(
+    "idx_messages_conv_created", Message.conversation_id, Message.created_at.desc()
+)
+
+
 class AdminSession(Base):
     """
     Admin session model.
@@ -165,7 +208,7 @@ class AdminSession(Base):
     __tablename__ = "admin_sessions"
 
     # Primary Key (session token)
-    id: Mapped[str] = mapped_column(String, primary_key=True, default=generate_uuid)
+    id: Mapped[str] = mapped_column(UUIDType, primary_key=True, default=generate_uuid)
 
     # Admin Info
     username: Mapped[str] = mapped_column(String(100), nullable=False)
@@ -179,7 +222,23 @@ class AdminSession(Base):
     expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
 
     # Timestamp
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=func.now(), server_default=func.now()
+    )
+
+    # Fetch server-generated timestamps via RETURNING on INSERT
+    __mapper_args__ = {"eager_defaults": True}
 
     def __repr__(self) -> str:
         return f"<AdminSession(id={self.id}, username={self.username})>"
+
+
+# Composite index so session lookups can check expiry without a row fetch.
+# On PostgreSQL the remaining columns are INCLUDEd, making the full
+# get_session_by_token lookup an index-only scan (ignored by SQLite)
+Index(
+    "idx_admin_sessions_token_exp",
+    AdminSession.token_hash,
+    AdminSession.expires_at,
+    postgresql_include=["id", "username", "created_at"],
+)
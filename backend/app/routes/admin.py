@@ -12,31 +12,212 @@ Endpoints:
 - POST /api/admin/bots/{bot_id}/regenerate-key - Regenerate API key
 """
 
+import asyncio
+import hashlib
 import logging
 import time
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
-from typing import List
-
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
-from PIL import Image
-from sqlalchemy import select
+from types import ModuleType
+from typing import Any, List, Optional
+
+import aiofiles
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    HTTPException,
+    Request,
+    Response,
+    UploadFile,
+    status,
+)
+from pydantic import TypeAdapter
+from sqlalchemy import delete, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.config import get_settings
+from app.config import settings
 from app.database import get_db
-from app.dependencies import get_current_admin
+from app.dependencies import get_current_admin, invalidate_bot_cache
 from app.models import AdminSession, Bot
+from app.routes.public import invalidate_config_cache
 from app.schemas import BotCreate, BotResponse, BotUpdate, MessageOnlyResponse
-
-settings = get_settings()
+from app.services import avatar_index
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Avatar uploads are read in 64KB chunks so oversized files abort early
+UPLOAD_CHUNK_SIZE = 64 * 1024
+AVATAR_SIZE = (64, 64)
+
+# Accepted avatar formats, identified by their magic bytes
+AVATAR_SIGNATURES = (
+    (b"\x89PNG\r\n\x1a\n", "PNG"),
+    (b"\xff\xd8\xff", "JPEG"),
+    (b"GIF87a", "GIF"),
+    (b"GIF89a", "GIF"),
+)
+# Enough leading bytes to match any signature above
+AVATAR_HEADER_SIZE = max(len(magic) for magic, _ in AVATAR_SIGNATURES)
+
+# Created at startup by settings.ensure_data_directories()
+AVATAR_DIR = settings.avatar_dir
+# Where app.main mounts AVATAR_DIR as static files
+AVATAR_URL_PREFIX = "/api/public/avatars/"
+
+# Read cache for list_bots/get_bot (per process; entries are dropped by every
+# mutating endpoint here, usage counters updated by chat may lag by the TTL)
+BOTS_CACHE_TTL = 60  # seconds
+BOTS_CACHE_MAX_SIZE = 128  # entries
+_ALL_BOTS_KEY = "all"
+
+# Validates/serializes the whole bot list in one call; schema is built once
+_BOT_LIST_ADAPTER = TypeAdapter(List[BotResponse])
+
+# "all" or bot_id -> (expires_at monotonic timestamp, BotResponse data)
+_bots_cache: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+
+def _get_cached_bots(key: str) -> Optional[Any]:
+    """
+    Get cached list_bots/get_bot response data if present and not expired.
+
+    Args:
+        key: "all" for the bot list, or a bot UUID
+
+    Returns:
+        Cached BotResponse (or list of them), or None on cache miss
+    """
+    entry = _bots_cache.get(key)
+    if entry is None:
+        return None
+
+    expires_at, value = entry
+    if expires_at < time.monotonic():
+        _bots_cache.pop(key, None)
+        return None
+
+    _bots_cache.move_to_end(key)
+    return value
+
+
+def _cache_bots(key: str, value: Any) -> None:
+    """
+    Store list_bots/get_bot response data in the read cache.
+
+    Args:
+        key: "all" for the bot list, or a bot UUID
+        value: BotResponse (or list of them) to cache
+    """
+    _bots_cache[key] = (time.monotonic() + BOTS_CACHE_TTL, value)
+    _bots_cache.move_to_end(key)
+
+    while len(_bots_cache) > BOTS_CACHE_MAX_SIZE:
+        _bots_cache.popitem(last=False)
+
+
+def _invalidate_bots_cache(bot_id: Optional[str] = None) -> None:
+    """
+    Drop the cached bot list and, if given, a single bot's entries
+    (including its public widget config).
+
+    Args:
+        bot_id: Bot UUID whose entry should be dropped
+    """
+    _bots_cache.pop(_ALL_BOTS_KEY, None)
+    if bot_id is not None:
+        _bots_cache.pop(bot_id, None)
+        invalidate_config_cache(bot_id)
+
+
+def _json_response(request: Request, content: bytes) -> Response:
+    """
+    Build a JSON response with a content-derived ETag.
+
+    Returns 304 Not Modified with no body when the client's If-None-Match
+    already matches, so polling admin pages skip the payload.
+
+    Args:
+        request: Incoming request
+        content: Serialized JSON body
+
+    Returns:
+        200 JSON response, or 304 if the client copy is current
+    """
+    etag = f'W/"{hashlib.md5(content, usedforsecurity=False).hexdigest()}"'
+    # Let the browser store the response but revalidate it on every use
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return Response(content=content, media_type="application/json", headers=headers)
+
+
+async def _get_bot_or_404(db: AsyncSession, bot_id: str) -> Bot:
+    """
+    Get bot by primary key or raise 404.
+
+    Uses session.get(), which is served from the identity map when the
+    bot is already loaded in this session.
+
+    Args:
+        db: Database session
+        bot_id: Bot UUID
+
+    Returns:
+        Bot object
+
+    Raises:
+        HTTPException: 404 if bot not found
+    """
+    bot = await db.get(Bot, bot_id)
+
+    if not bot:
+        raise _bot_not_found(bot_id)
+
+    return bot
+
+
+async def _get_avatar_url_or_404(db: AsyncSession, bot_id: str) -> Optional[str]:
+    """
+    Get a bot's avatar_url (None if unset) or raise 404.
+
+    Selects the single column instead of loading the whole Bot row.
+
+    Args:
+        db: Database session
+        bot_id: Bot UUID
+
+    Returns:
+        Current avatar URL, or None if the bot has no avatar
+
+    Raises:
+        HTTPException: 404 if bot not found
+    """
+    result = await db.execute(select(Bot.avatar_url).where(Bot.id == bot_id))
+    row = result.first()
+
+    if not row:
+        raise _bot_not_found(bot_id)
+
+    return row.avatar_url
+
+
+def _bot_not_found(bot_id: str) -> HTTPException:
+    """Build the 404 raised when a bot id matches no row."""
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail=f"Bot with id {bot_id} not found",
+    )
+
 
 @router.get("/bots", response_model=List[BotResponse])
 async def list_bots(
+    request: Request,
     db: AsyncSession = Depends(get_db),
     admin: AdminSession = Depends(get_current_admin),
 ):
@@ -46,18 +227,27 @@ async def list_bots(
     Returns list of all bots with their configuration and stats.
 
     Args:
+        request: Incoming request (for If-None-Match)
         db: Database session
         admin: Current authenticated admin
 
     Returns:
-        List of BotResponse objects
+        List of BotResponse objects (304 if unchanged since the client's ETag)
     """
-    result = await db.execute(select(Bot).order_by(Bot.created_at.desc()))
-    bots = result.scalars().all()
+    bots = _get_cached_bots(_ALL_BOTS_KEY)
+
+    if bots is None:
+        result = await db.execute(select(Bot).order_by(Bot.created_at.desc()))
+        bots = _BOT_LIST_ADAPTER.validate_python(
+            result.scalars().all(), from_attributes=True
+        )
+        _cache_bots(_ALL_BOTS_KEY, bots)
 
     logger.info(f"Admin {admin.username} listed {len(bots)} bots")
 
-    return bots
+    # Data is already validated; serialize directly instead of letting
+    # FastAPI re-validate it against response_model
+    return _json_response(request, _BOT_LIST_ADAPTER.dump_json(bots))
 
 
 @router.post("/bots", response_model=BotResponse, status_code=status.HTTP_201_CREATED)
@@ -85,9 +275,11 @@ async def create_bot(
     # Create new bot (UUID and API key generated automatically by model defaults)
     bot = Bot(**bot_data.model_dump())
 
+    # eager_defaults fetches the server-generated timestamps via
+    # INSERT ... RETURNING, so no follow-up SELECT/refresh is needed
     db.add(bot)
     await db.commit()
-    await db.refresh(bot)
+    _invalidate_bots_cache()
 
     logger.info(f"Admin {admin.username} created bot: {bot.id} ({bot.name})")
 
@@ -97,6 +289,7 @@ async def create_bot(
 @router.get("/bots/{bot_id}", response_model=BotResponse)
 async def get_bot(
     bot_id: str,
+    request: Request,
     db: AsyncSession = Depends(get_db),
     admin: AdminSession = Depends(get_current_admin),
 ):
@@ -105,27 +298,25 @@ async def get_bot(
 
     Args:
         bot_id: Bot UUID
+        request: Incoming request (for If-None-Match)
         db: Database session
         admin: Current authenticated admin
 
     Returns:
-        BotResponse object
+        BotResponse object (304 if unchanged since the client's ETag)
 
     Raises:
         HTTPException: 404 if bot not found
     """
-    result = await db.execute(select(Bot).where(Bot.id == bot_id))
-    bot = result.scalar_one_or_none()
+    bot = _get_cached_bots(bot_id)
 
-    if not bot:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Bot with id {bot_id} not found",
-        )
+    if bot is None:
+        bot = BotResponse.model_validate(await _get_bot_or_404(db, bot_id))
+        _cache_bots(bot_id, bot)
 
     logger.info(f"Admin {admin.username} viewed bot: {bot.id} ({bot.name})")
 
-    return bot
+    return _json_response(request, bot.model_dump_json().encode())
 
 
 @router.put("/bots/{bot_id}", response_model=BotResponse)
@@ -152,23 +343,20 @@ async def update_bot(
     Raises:
         HTTPException: 404 if bot not found
     """
-    # Get existing bot
-    result = await db.execute(select(Bot).where(Bot.id == bot_id))
+    # Update only provided fields in one UPDATE ... RETURNING round trip
+    update_data = bot_data.model_dump(exclude_unset=True)
+    result = await db.execute(
+        update(Bot).where(Bot.id == bot_id).values(**update_data).returning(Bot),
+        execution_options={"synchronize_session": False},
+    )
     bot = result.scalar_one_or_none()
 
     if not bot:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Bot with id {bot_id} not found",
-        )
-
-    # Update only provided fields
-    update_data = bot_data.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(bot, field, value)
+        raise _bot_not_found(bot_id)
 
     await db.commit()
-    await db.refresh(bot)
+    invalidate_bot_cache(bot.api_key)
+    _invalidate_bots_cache(bot_id)
 
     logger.info(f"Admin {admin.username} updated bot: {bot.id} ({bot.name})")
 
@@ -198,22 +386,23 @@ async def delete_bot(
     Raises:
         HTTPException: 404 if bot not found
     """
-    # Get existing bot
-    result = await db.execute(select(Bot).where(Bot.id == bot_id))
-    bot = result.scalar_one_or_none()
-
-    if not bot:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Bot with id {bot_id} not found",
-        )
+    # Delete bot in one statement (the database's ON DELETE CASCADE
+    # removes its conversations and messages)
+    result = await db.execute(
+        delete(Bot).where(Bot.id == bot_id).returning(Bot.name, Bot.api_key),
+        execution_options={"synchronize_session": False},
+    )
+    row = result.first()
 
-    bot_name = bot.name
+    if not row:
+        raise _bot_not_found(bot_id)
 
-    # Delete bot (cascade will handle conversations and messages)
-    await db.delete(bot)
     await db.commit()
 
+    bot_name, api_key = row
+    invalidate_bot_cache(api_key)
+    _invalidate_bots_cache(bot_id)
+
     # Delete Qdrant vectors for this bot_id (Phase 4)
     try:
         from app.services.qdrant_client import delete_vectors
@@ -229,6 +418,174 @@ async def delete_bot(
     return MessageOnlyResponse(message=f"Bot '{bot_name}' deleted successfully")
 
 
+def _avatar_files(bot_id: str, avatar_url: Optional[str]) -> List[Path]:
+    """
+    Resolve the avatar file(s) referenced by a bot's avatar_url.
+
+    Avatar URLs end with the stored filename, so the file is found
+    directly without scanning the avatars directory.
+
+    Args:
+        bot_id: Bot UUID
+        avatar_url: Current avatar_url of the bot
+
+    Returns:
+        Paths of the bot's avatar files (may no longer exist on disk)
+    """
+    if not avatar_url:
+        return []
+
+    if avatar_url.startswith(AVATAR_URL_PREFIX):
+        return [AVATAR_DIR / avatar_url.removeprefix(AVATAR_URL_PREFIX)]
+
+    # Legacy /api/public/avatar/{bot_id} URLs don't identify the file
+    return list(AVATAR_DIR.glob(f"{bot_id}_*.png"))
+
+
+def _remove_avatar_files(bot_id: str, avatar_url: Optional[str]) -> None:
+    """
+    Delete the avatar file(s) referenced by a bot's avatar_url.
+
+    Blocking (filesystem); run via asyncio.to_thread.
+
+    Args:
+        bot_id: Bot UUID
+        avatar_url: Current avatar_url of the bot
+    """
+    for avatar_file in _avatar_files(bot_id, avatar_url):
+        avatar_file.unlink(missing_ok=True)
+        logger.info(f"Deleted avatar file: {avatar_file}")
+
+
+@lru_cache(maxsize=1)
+def _load_pyvips() -> Optional[ModuleType]:
+    """
+    Import pyvips once, returning None if it or libvips is unavailable.
+
+    Returns:
+        The pyvips module, or None to fall back to Pillow
+    """
+    try:
+        import pyvips
+    except (ImportError, OSError) as e:
+        logger.info(f"pyvips unavailable ({e}), processing avatars with Pillow")
+        return None
+
+    # libvips logs every operation at INFO level
+    logging.getLogger("pyvips").setLevel(logging.WARNING)
+    return pyvips
+
+
+def _process_avatar(contents: bytes, image_format: str) -> bytes:
+    """
+    Resize an uploaded image to a 64x64 avatar and encode it as PNG.
+
+    Uses libvips when installed, otherwise Pillow. Blocking; run via
+    asyncio.to_thread.
+
+    Args:
+        contents: Validated image bytes
+        image_format: Pillow format detected from the magic bytes
+
+    Returns:
+        Encoded PNG bytes
+
+    Raises:
+        ValueError: If the image cannot be decoded or processed
+    """
+    pyvips = _load_pyvips()
+    if pyvips is None:
+        return _process_avatar_pillow(contents, image_format)
+
+    try:
+        # Shrink-on-load: libvips decodes only the pixels a 64x64 result needs
+        image = pyvips.Image.thumbnail_buffer(
+            contents, AVATAR_SIZE[0], height=AVATAR_SIZE[1]
+        )
+
+        # Only accept the decoder matching the magic bytes
+        if not image.get("vips-loader").startswith(image_format.lower()):
+            raise ValueError(f"Image data does not match {image_format} format")
+
+        # Normalize to 3-band sRGB, flattening transparency onto white
+        image = image.colourspace("srgb")
+        if image.hasalpha():
+            image = image.flatten(background=[255, 255, 255])
+
+        # Center on a white 64x64 canvas (thumbnail keeps aspect ratio)
+        image = image.gravity(
+            "centre", *AVATAR_SIZE, extend="background", background=[255, 255, 255]
+        )
+
+        return image.pngsave_buffer(compression=1, keep="none")
+
+    except pyvips.Error as e:
+        raise ValueError(str(e)) from e
+
+
+def _process_avatar_pillow(contents: bytes, image_format: str) -> bytes:
+    """
+    Pillow implementation of _process_avatar.
+
+    Args:
+        contents: Validated image bytes
+        image_format: Pillow format detected from the magic bytes
+
+    Returns:
+        Encoded PNG bytes
+
+    Raises:
+        ValueError: If the image cannot be decoded or processed
+    """
+    from io import BytesIO
+
+    from PIL import Image
+
+    try:
+        # Only try the decoder matching the magic bytes
+        image = Image.open(BytesIO(contents), formats=[image_format])
+
+        # Let libjpeg decode at a reduced DCT scale (no-op for PNG/GIF)
+        image.draft("RGB", (AVATAR_SIZE[0] * 2, AVATAR_SIZE[1] * 2))
+
+        # Convert to RGB if necessary (for transparency)
+        if image.mode in ("RGBA", "LA", "P"):
+            # Palette images resize with nearest-neighbour only; expand first
+            if image.mode == "P":
+                image = image.convert("RGBA")
+
+            # Shrink before flattening so the split/background/paste work
+            # on at most 128x128 pixels instead of the full upload
+            image.thumbnail(
+                (AVATAR_SIZE[0] * 2, AVATAR_SIZE[1] * 2), Image.Resampling.BILINEAR
+            )
+
+            # Create white background
+            background = Image.new("RGB", image.size, (255, 255, 255))
+            background.paste(image, mask=image.split()[-1])
+            image = background
+
+        # Shrink to fit 64x64 (keeping aspect ratio) and center on white.
+        # reducing_gap box-reduces by an integer factor first, so the
+        # cheaper bilinear filter only covers the last <2x step
+        image.thumbnail(AVATAR_SIZE, Image.Resampling.BILINEAR, reducing_gap=2.0)
+        canvas = Image.new("RGB", AVATAR_SIZE, (255, 255, 255))
+        canvas.paste(
+            image,
+            ((AVATAR_SIZE[0] - image.width) // 2, (AVATAR_SIZE[1] - image.height) // 2),
+        )
+        image = canvas
+
+    except Exception as e:
+        raise ValueError(str(e)) from e
+
+    # Encode in memory (fast zlib level: optimize=True costs far more CPU than
+    # it saves bytes on a 64x64 image)
+    output = BytesIO()
+    image.save(output, format="PNG", compress_level=1)
+    return output.getvalue()
+
+
 @router.post("/bots/{bot_id}/avatar", response_model=BotResponse)
 async def upload_avatar(
     bot_id: str,
@@ -254,83 +611,73 @@ async def upload_avatar(
     Raises:
         HTTPException: 404 if bot not found, 400 if validation fails
     """
-    # Get existing bot
-    result = await db.execute(select(Bot).where(Bot.id == bot_id))
-    bot = result.scalar_one_or_none()
-
-    if not bot:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Bot with id {bot_id} not found",
-        )
-
-    # Validate file size (max 500KB)
-    contents = await file.read()
-    if len(contents) > 500 * 1024:  # 500KB
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="File size exceeds 500KB limit",
-        )
+    # Only the current avatar_url is needed (and confirms the bot exists)
+    current_url = await _get_avatar_url_or_404(db, bot_id)
 
-    # Validate file type using magic numbers (first few bytes)
-    # PNG: 89 50 4E 47, JPEG: FF D8 FF, GIF: 47 49 46
-    if not (
-        contents.startswith(b"\x89PNG")  # PNG
-        or contents.startswith(b"\xff\xd8\xff")  # JPEG
-        or contents.startswith(b"GIF8")  # GIF
-    ):
+    # Validate file type using magic numbers before reading the rest
+    head = await file.read(AVATAR_HEADER_SIZE)
+    image_format = next(
+        (fmt for magic, fmt in AVATAR_SIGNATURES if head.startswith(magic)), None
+    )
+    if image_format is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid image format. Only PNG, JPEG, and GIF are supported.",
         )
 
-    # Open image with Pillow
-    try:
-        from io import BytesIO
-
-        image = Image.open(BytesIO(contents))
-
-        # Convert to RGB if necessary (for transparency)
-        if image.mode in ("RGBA", "LA", "P"):
-            # Create white background
-            background = Image.new("RGB", image.size, (255, 255, 255))
-            if image.mode == "P":
-                image = image.convert("RGBA")
-            background.paste(image, mask=image.split()[-1] if image.mode in ("RGBA", "LA") else None)
-            image = background
+    # Read upload incrementally, aborting as soon as it exceeds the size limit
+    max_size = settings.avatar_max_size_kb * 1024
+    contents = bytearray(head)
+    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+        contents += chunk
+        if len(contents) > max_size:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"File size exceeds {settings.avatar_max_size_kb}KB limit",
+            )
+    contents = bytes(contents)
 
-        # Resize to 64x64
-        image = image.resize((64, 64), Image.Resampling.LANCZOS)
+    # Name avatars by content hash: re-uploading the current image is a no-op
+    avatar_filename = f"{bot_id}_{hashlib.sha256(contents).hexdigest()[:16]}.png"
+    avatar_url = f"{AVATAR_URL_PREFIX}{avatar_filename}"
+    if current_url == avatar_url:
+        logger.info(f"Avatar for bot {bot_id} unchanged, skipping processing")
+        return await _get_bot_or_404(db, bot_id)
 
-    except Exception as e:
+    # Decode, resize and encode off the event loop (CPU-bound)
+    try:
+        png_bytes = await asyncio.to_thread(_process_avatar, contents, image_format)
+    except ValueError as e:
         logger.error(f"Failed to process image: {e}")
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Failed to process image: {str(e)}",
         )
 
-    # Create avatars directory if not exists
-    avatar_dir = Path(settings.upload_path) / "avatars"
-    avatar_dir.mkdir(parents=True, exist_ok=True)
-
-    # Delete old avatar if exists
-    old_avatars = list(avatar_dir.glob(f"{bot_id}_*.png"))
-    for old_avatar in old_avatars:
-        old_avatar.unlink()
-        logger.info(f"Deleted old avatar: {old_avatar}")
-
-    # Save new avatar
-    timestamp = int(time.time())
-    avatar_filename = f"{bot_id}_{timestamp}.png"
-    avatar_path = avatar_dir / avatar_filename
-
-    image.save(avatar_path, format="PNG", optimize=True)
+    # Delete old avatar if exists, then write the new one
+    await asyncio.to_thread(_remove_avatar_files, bot_id, current_url)
+
+    avatar_path = AVATAR_DIR / avatar_filename
+    async with aiofiles.open(avatar_path, "wb") as f:
+        await f.write(png_bytes)
+    avatar_index.set_avatar(bot_id, avatar_path)
+
+    # Update bot avatar_url (served by the static avatars mount)
+    result = await db.execute(
+        update(Bot)
+        .where(Bot.id == bot_id)
+        .values(avatar_url=avatar_url)
+        .returning(Bot),
+        execution_options={"synchronize_session": False},
+    )
+    bot = result.scalar_one_or_none()
 
-    # Update bot avatar_url
-    bot.avatar_url = f"/api/public/avatar/{bot_id}"
+    if not bot:
+        raise _bot_not_found(bot_id)
 
     await db.commit()
-    await db.refresh(bot)
+    invalidate_bot_cache(bot.api_key)
+    _invalidate_bots_cache(bot_id)
 
     logger.info(f"Admin {admin.username} uploaded avatar for bot: {bot.id} ({bot.name})")
 
@@ -359,38 +706,36 @@ async def delete_avatar(
     Raises:
         HTTPException: 404 if bot not found or avatar doesn't exist
     """
-    # Get existing bot
-    result = await db.execute(select(Bot).where(Bot.id == bot_id))
-    bot = result.scalar_one_or_none()
-
-    if not bot:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Bot with id {bot_id} not found",
-        )
+    avatar_url = await _get_avatar_url_or_404(db, bot_id)
 
-    # Find and delete avatar files
-    avatar_dir = Path(settings.upload_path) / "avatars"
-    avatar_files = list(avatar_dir.glob(f"{bot_id}_*.png"))
-
-    if not avatar_files:
+    if not avatar_url:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"No avatar found for bot {bot_id}",
         )
 
-    # Delete all avatar files for this bot
-    for avatar_file in avatar_files:
-        avatar_file.unlink()
-        logger.info(f"Deleted avatar file: {avatar_file}")
+    # Delete the avatar file(s) named by avatar_url off the event loop
+    await asyncio.to_thread(_remove_avatar_files, bot_id, avatar_url)
+    avatar_index.remove_avatar(bot_id)
 
     # Clear avatar_url
-    bot.avatar_url = None
+    result = await db.execute(
+        update(Bot)
+        .where(Bot.id == bot_id)
+        .values(avatar_url=None)
+        .returning(Bot.api_key, Bot.name),
+        execution_options={"synchronize_session": False},
+    )
+    row = result.first()
+
+    if not row:
+        raise _bot_not_found(bot_id)
 
     await db.commit()
-    await db.refresh(bot)
+    invalidate_bot_cache(row.api_key)
+    _invalidate_bots_cache(bot_id)
 
-    logger.info(f"Admin {admin.username} deleted avatar for bot: {bot.id} ({bot.name})")
+    logger.info(f"Admin {admin.username} deleted avatar for bot: {bot_id} ({row.name})")
 
     return MessageOnlyResponse(message="Avatar deleted successfully")
 
@@ -418,29 +763,31 @@ async def regenerate_api_key(
     Raises:
         HTTPException: 404 if bot not found
     """
-    # Get existing bot
-    result = await db.execute(select(Bot).where(Bot.id == bot_id))
+    # Generate new API key
+    from app.models import generate_uuid
+
+    result = await db.execute(
+        update(Bot)
+        .where(Bot.id == bot_id)
+        .values(api_key=generate_uuid())
+        .returning(Bot),
+        execution_options={"synchronize_session": False},
+    )
     bot = result.scalar_one_or_none()
 
     if not bot:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Bot with id {bot_id} not found",
-        )
-
-    # Generate new API key (UUID will be auto-generated by generate_uuid)
-    from app.models import generate_uuid
-
-    old_key = bot.api_key
-    bot.api_key = generate_uuid()
+        raise _bot_not_found(bot_id)
 
     await db.commit()
-    await db.refresh(bot)
+
+    # RETURNING only yields the new key, so drop every cached key
+    invalidate_bot_cache()
+    _invalidate_bots_cache(bot_id)
 
     logger.info(
         f"Admin {admin.username} regenerated API key for bot: {bot.id} ({bot.name})"
     )
-    logger.warning(f"Old API key invalidated: {old_key[:8]}...")
+    logger.warning(f"Old API key for bot {bot.id} invalidated")
 
     return bot
 
@@ -469,14 +816,7 @@ async def ingest_content(
         HTTPException: 404 if bot not found, 400 if ingestion fails
     """
     # Get existing bot
-    result = await db.execute(select(Bot).where(Bot.id == bot_id))
-    bot = result.scalar_one_or_none()
-
-    if not bot:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Bot with id {bot_id} not found",
-        )
+    bot = await _get_bot_or_404(db, bot_id)
 
     if not bot.source_content:
         raise HTTPException(
@@ -493,7 +833,6 @@ async def ingest_content(
         # Import services
         from app.services.chunker import chunk_text
         from app.services.embeddings import embed_and_store
-        from app.services.qdrant_client import delete_vectors
         from app.services.scraper import scrape_url
 
         # Get content based on source type
@@ -540,17 +879,18 @@ async def ingest_content(
 
         logger.info(f"Created {len(chunks)} chunks")
 
-        # Delete old vectors first
-        logger.info("Clearing old vectors...")
-        await delete_vectors(bot_id)
-
-        # Generate embeddings and store
+        # Replace old vectors (cleared while the first embeddings generate)
         logger.info("Generating embeddings and storing in Qdrant...")
-        vector_count = await embed_and_store(bot_id, chunks)
+        vector_count = await embed_and_store(bot_id, chunks, replace=True)
 
-        # Update bot timestamp
-        bot.updated_at = bot.updated_at  # Trigger SQLAlchemy update
+        # Update bot timestamp (assigning the unchanged ORM value never
+        # reached the database, so set it explicitly)
+        await db.execute(
+            update(Bot).where(Bot.id == bot_id).values(updated_at=func.now()),
+            execution_options={"synchronize_session": False},
+        )
         await db.commit()
+        _invalidate_bots_cache(bot_id)
 
         logger.info(
             f"Admin {admin.username} completed ingestion for bot {bot_id}: "
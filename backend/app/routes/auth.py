@@ -6,13 +6,14 @@ Endpoints:
 - POST /api/auth/logout - Admin logout
 """
 
+import asyncio
 import logging
 
 from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.config import get_settings
+from app.config import settings
 from app.database import get_db
 from app.dependencies import get_current_admin
 from app.models import AdminSession
@@ -25,8 +26,6 @@ from app.services.auth_service import (
 )
 
 logger = logging.getLogger(__name__)
-settings = get_settings()
-
 router = APIRouter()
 
 
@@ -67,8 +66,11 @@ async def login(
             detail="Invalid username or password",
         )
 
-    # Verify password
-    if not verify_password(credentials.password, ADMIN_CREDENTIALS["password_hash"]):
+    # Verify password (bcrypt is CPU-bound; keep it off the event loop)
+    password_ok = await asyncio.to_thread(
+        verify_password, credentials.password, ADMIN_CREDENTIALS["password_hash"]
+    )
+    if not password_ok:
         logger.warning(f"Failed login attempt for user: {credentials.username}")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
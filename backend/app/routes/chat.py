@@ -4,69 +4,78 @@ Chat endpoints for widget API.
 Provides the main chat endpoint with SSE streaming for real-time responses.
 """
 
+import asyncio
 import logging
-from datetime import datetime, timedelta
-from typing import Optional
+import time
 
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.responses import StreamingResponse
-from sqlalchemy import select
+from sqlalchemy import and_, bindparam, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
+from app.dependencies import BotAuthInfo, cache_bot, get_cached_bot
 from app.models import Bot, Conversation, Message, generate_uuid
 from app.schemas import ChatRequest
-from app.services.chat_service import generate_response
+from app.services.chat_service import generate_response, retrieve_context
+from app.services.rate_limiter import check_rate_limit
+from app.services.usage_counter import pending_message_count, record_message
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
-# Rate limiting configuration
-RATE_LIMIT_WINDOW = 60  # seconds
-MAX_MESSAGES_PER_WINDOW = 10  # messages per session per window
-_rate_limit_cache: dict[str, list[datetime]] = {}
-
-
-def check_rate_limit(session_id: str) -> tuple[bool, Optional[str]]:
-    """
-    Check if session has exceeded rate limit.
-
-    Args:
-        session_id: Session identifier
-
-    Returns:
-        Tuple of (is_allowed, error_message)
-    """
-    now = datetime.utcnow()
-    window_start = now - timedelta(seconds=RATE_LIMIT_WINDOW)
-
-    # Get recent requests for this session
-    if session_id not in _rate_limit_cache:
-        _rate_limit_cache[session_id] = []
-
-    recent_requests = _rate_limit_cache[session_id]
-
-    # Remove old requests outside the window
-    recent_requests = [ts for ts in recent_requests if ts > window_start]
-    _rate_limit_cache[session_id] = recent_requests
-
-    # Check limit
-    if len(recent_requests) >= MAX_MESSAGES_PER_WINDOW:
-        return False, f"Rate limit exceeded: max {MAX_MESSAGES_PER_WINDOW} messages per {RATE_LIMIT_WINDOW} seconds"
-
-    # Add current request
-    _rate_limit_cache[session_id].append(now)
-
-    return True, None
+# SSE token batching: flush buffered events at most every 20ms or 1KB, so
+# fast token streams don't cost one ASGI write per token
+SSE_FLUSH_INTERVAL = 0.02  # seconds
+SSE_FLUSH_SIZE = 1024  # characters
+
+# Hot-path statements built once at import; values are bound per call
+# Validates the bot's API key and finds the session's conversation (if any)
+# in one round trip; used when the bot isn't in the API key cache
+_SELECT_BOT_AND_CONVERSATION = (
+    select(
+        Bot.id,
+        Bot.api_key,
+        Bot.message_count,
+        Bot.message_limit,
+        Bot.name,
+        Conversation,
+    )
+    .outerjoin(
+        Conversation,
+        and_(
+            Conversation.bot_id == Bot.id,
+            Conversation.session_id == bindparam("session_id"),
+        ),
+    )
+    .where(Bot.id == bindparam("bot_id"), Bot.api_key == bindparam("api_key"))
+    .limit(1)
+)
+_SELECT_CONVERSATION = (
+    select(Conversation)
+    .where(
+        Conversation.bot_id == bindparam("bot_id"),
+        Conversation.session_id == bindparam("session_id"),
+    )
+    .limit(1)
+)
+_SELECT_RECENT_MESSAGES = (
+    select(Message)
+    .where(Message.conversation_id == bindparam("conversation_id"))
+    .order_by(Message.created_at.desc())
+    .limit(bindparam("limit"))
+)
 
 
-async def get_or_create_conversation(
+async def create_conversation(
     db: AsyncSession,
     bot_id: str,
     session_id: str,
 ) -> Conversation:
     """
-    Get existing conversation or create new one.
+    Create a new conversation for a widget session.
+
+    Existing conversations are found by the chat endpoint's bot lookup.
 
     Args:
         db: Database session
@@ -76,20 +85,6 @@ async def get_or_create_conversation(
     Returns:
         Conversation instance
     """
-    # Try to find existing conversation
-    result = await db.execute(
-        select(Conversation).where(
-            Conversation.bot_id == bot_id,
-            Conversation.session_id == session_id,
-        )
-    )
-    conversation = result.scalar_one_or_none()
-
-    if conversation:
-        logger.info(f"Found existing conversation: {conversation.id}")
-        return conversation
-
-    # Create new conversation
     conversation = Conversation(
         id=generate_uuid(),
         bot_id=bot_id,
@@ -97,7 +92,6 @@ async def get_or_create_conversation(
     )
     db.add(conversation)
     await db.commit()
-    await db.refresh(conversation)
 
     logger.info(f"Created new conversation: {conversation.id}")
     return conversation
@@ -120,10 +114,7 @@ async def get_conversation_history(
         List of Message instances (oldest first)
     """
     result = await db.execute(
-        select(Message)
-        .where(Message.conversation_id == conversation_id)
-        .order_by(Message.created_at.desc())
-        .limit(limit)
+        _SELECT_RECENT_MESSAGES, {"conversation_id": conversation_id, "limit": limit}
     )
     messages = result.scalars().all()
 
@@ -140,49 +131,61 @@ async def save_messages(
     """
     Save user and assistant messages to database.
 
+    Both rows go in one multi-row INSERT, bypassing the ORM unit of
+    work; the caller commits.
+
     Args:
         db: Database session
         conversation_id: Conversation UUID
         user_message: User's message
         assistant_message: Assistant's response
     """
-    # Save user message
-    user_msg = Message(
-        id=generate_uuid(),
-        conversation_id=conversation_id,
-        role="user",
-        content=user_message,
-    )
-    db.add(user_msg)
-
-    # Save assistant message
-    assistant_msg = Message(
-        id=generate_uuid(),
-        conversation_id=conversation_id,
-        role="assistant",
-        content=assistant_message,
-    )
-    db.add(assistant_msg)
+    user_row = {
+        "id": generate_uuid(),
+        "conversation_id": conversation_id,
+        "role": "user",
+        "content": user_message,
+    }
+    assistant_row = {
+        "id": generate_uuid(),
+        "conversation_id": conversation_id,
+        "role": "assistant",
+        "content": assistant_message,
+    }
+    await db.execute(insert(Message).values([user_row, assistant_row]))
 
-    await db.commit()
     logger.info(f"Saved 2 messages for conversation {conversation_id}")
 
 
+def _retrieve_task_exception(task: asyncio.Task) -> None:
+    """
+    Mark a task's exception as retrieved.
+
+    If the client disconnects before the response body starts, the
+    generator (and its finally) never runs, so nothing awaits the task.
+    When it is awaited, stream_response reports the error itself.
+    """
+    if not task.cancelled():
+        task.exception()
+
+
 async def stream_response(
-    bot: Bot,
+    bot: BotAuthInfo,
     conversation: Conversation,
     user_message: str,
     conversation_history: list[Message],
+    context_task: asyncio.Task[list[dict]],
     db: AsyncSession,
 ):
     """
     Stream SSE response from chat service.
 
     Args:
-        bot: Bot instance
+        bot: Bot auth info
         conversation: Conversation instance
         user_message: User's message
         conversation_history: Previous messages
+        context_task: Task retrieving knowledge base context
         db: Database session
 
     Yields:
@@ -191,22 +194,64 @@ async def stream_response(
     # Accumulate response for saving
     full_response = ""
 
+    # SSE events waiting to be flushed
+    pending: list[str] = []
+    pending_size = 0
+    last_flush = time.monotonic()
+    next_token: asyncio.Future[str] | None = None
+
     try:
         # Generate streaming response
-        async for token in generate_response(bot, user_message, conversation_history):
+        context_chunks = await context_task
+        tokens = generate_response(
+            bot, user_message, conversation_history, context_chunks
+        )
+        while True:
+            if next_token is None:
+                next_token = asyncio.ensure_future(anext(tokens))
+
+            # Wait only as long as buffered events may stay unsent, so a slow
+            # model doesn't hold back tokens that have already arrived
+            timeout = None
+            if pending:
+                timeout = max(0.0, SSE_FLUSH_INTERVAL - (time.monotonic() - last_flush))
+            done, _ = await asyncio.wait({next_token}, timeout=timeout)
+
+            if not done:
+                yield "".join(pending)
+                pending.clear()
+                pending_size = 0
+                last_flush = time.monotonic()
+                continue
+
+            try:
+                token = next_token.result()
+            except StopAsyncIteration:
+                break
+            finally:
+                next_token = None
+
             full_response += token
             # Format as SSE event
-            yield f"data: {token}\n\n"
-
-        # Send completion signal
-        yield "data: [DONE]\n\n"
-
-        # Save messages to database
+            event = f"data: {token}\n\n"
+            pending.append(event)
+            pending_size += len(event)
+
+            if pending_size >= SSE_FLUSH_SIZE:
+                yield "".join(pending)
+                pending.clear()
+                pending_size = 0
+                last_flush = time.monotonic()
+
+        # Send remaining events with the completion signal
+        pending.append("data: [DONE]\n\n")
+        yield "".join(pending)
+        pending.clear()
+
+        # Save messages; the bot's message_count is flushed in the background
         await save_messages(db, conversation.id, user_message, full_response)
-
-        # Increment bot message count
-        bot.message_count += 1
         await db.commit()
+        record_message(bot.id)
 
         logger.info(
             f"Chat completed for bot {bot.id}: "
@@ -215,8 +260,16 @@ async def stream_response(
 
     except Exception as e:
         logger.error(f"Error during streaming: {e}")
-        yield f"data: Error: {str(e)}\n\n"
-        yield "data: [DONE]\n\n"
+        pending.append(f"data: Error: {str(e)}\n\n")
+        pending.append("data: [DONE]\n\n")
+        yield "".join(pending)
+
+    finally:
+        # The client may disconnect before retrieval is awaited; don't leave
+        # the task running or its exception unretrieved
+        context_task.cancel()
+        if next_token is not None:
+            next_token.cancel()
 
 
 @router.post("/chat")
@@ -244,32 +297,48 @@ async def chat(
         f"message_len={len(request.message)}"
     )
 
-    # Validate bot and API key
-    result = await db.execute(
-        select(Bot).where(
-            Bot.id == request.bot_id,
-            Bot.api_key == request.api_key,
+    # Validate bot and API key: a cached bot only needs its conversation
+    # looked up, otherwise fetch the bot and conversation together
+    bot = get_cached_bot(request.api_key)
+    if bot is not None and bot.id == request.bot_id:
+        result = await db.execute(
+            _SELECT_CONVERSATION,
+            {"bot_id": bot.id, "session_id": request.session_id},
         )
-    )
-    bot = result.scalar_one_or_none()
-
-    if not bot:
-        logger.warning(f"Invalid bot_id or api_key: {request.bot_id}")
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid bot_id or api_key",
+        conversation = result.scalar_one_or_none()
+    else:
+        result = await db.execute(
+            _SELECT_BOT_AND_CONVERSATION,
+            {
+                "bot_id": request.bot_id,
+                "api_key": request.api_key,
+                "session_id": request.session_id,
+            },
         )
-
-    # Check bot message limit
-    if bot.message_count >= bot.message_limit:
-        logger.warning(f"Bot {bot.id} has reached message limit: {bot.message_count}/{bot.message_limit}")
+        row = result.first()
+
+        if not row:
+            logger.warning(f"Invalid bot_id or api_key: {request.bot_id}")
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid bot_id or api_key",
+            )
+
+        *bot_columns, conversation = row
+        bot = BotAuthInfo(*bot_columns)
+        cache_bot(bot)
+
+    # Check bot message limit (including counts not yet flushed)
+    message_count = bot.message_count + pending_message_count(bot.id)
+    if message_count >= bot.message_limit:
+        logger.warning(f"Bot {bot.id} has reached message limit: {message_count}/{bot.message_limit}")
         raise HTTPException(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
             detail=f"Bot has reached its message limit ({bot.message_limit} messages)",
         )
 
     # Check rate limiting
-    is_allowed, error_msg = check_rate_limit(request.session_id)
+    is_allowed, error_msg = await check_rate_limit(request.session_id)
     if not is_allowed:
         logger.warning(f"Rate limit exceeded for session {request.session_id}")
         raise HTTPException(
@@ -277,15 +346,33 @@ async def chat(
             detail=error_msg,
         )
 
-    # Get or create conversation
-    conversation = await get_or_create_conversation(db, bot.id, request.session_id)
+    # Start retrieval (query embedding + vector search) so its network
+    # round trips overlap with the conversation queries below
+    context_task = asyncio.create_task(retrieve_context(bot.id, request.message))
+    context_task.add_done_callback(_retrieve_task_exception)
 
-    # Get conversation history
-    conversation_history = await get_conversation_history(db, conversation.id)
+    try:
+        if conversation:
+            logger.info(f"Found existing conversation: {conversation.id}")
+            conversation_history = await get_conversation_history(db, conversation.id)
+        else:
+            # First message of the session: nothing to fetch
+            conversation = await create_conversation(db, bot.id, request.session_id)
+            conversation_history = []
+    except BaseException:
+        context_task.cancel()
+        raise
 
     # Stream response
     return StreamingResponse(
-        stream_response(bot, conversation, request.message, conversation_history, db),
+        stream_response(
+            bot,
+            conversation,
+            request.message,
+            conversation_history,
+            context_task,
+            db,
+        ),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
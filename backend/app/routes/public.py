@@ -2,66 +2,189 @@
 Public routes for widget integration.
 
 Endpoints:
-- GET /api/public/avatar/{bot_id} - Serve bot avatar image
+- GET /api/public/avatar/{bot_id} - Serve bot avatar image (legacy avatar URLs)
 - GET /api/public/config/{bot_id} - Get public bot configuration
+
+Current avatar URLs (/api/public/avatars/{filename}) are served by the
+AvatarStaticFiles mount in app.main.
 """
 
+import asyncio
 import logging
-from pathlib import Path
+import time
+from collections import OrderedDict
+from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from fastapi.responses import FileResponse
-from sqlalchemy import select
+from fastapi.staticfiles import StaticFiles
+from sqlalchemy import bindparam, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.responses import Response
+from starlette.types import Scope
 
-from app.config import get_settings
 from app.database import get_db
 from app.models import Bot
 from app.schemas import BotPublicConfig
+from app.services.avatar_index import resolve_avatar
 
 logger = logging.getLogger(__name__)
-settings = get_settings()
-
 router = APIRouter()
 
+# Built once at import; bot_id and api_key are bound per request. Selects
+# only the BotPublicConfig columns (never source_content or the key itself)
+_SELECT_PUBLIC_CONFIG = (
+    select(
+        Bot.name,
+        Bot.welcome_message,
+        Bot.avatar_url,
+        Bot.accent_color,
+        Bot.position,
+        Bot.show_button_text,
+        Bot.button_text,
+    )
+    .where(Bot.id == bindparam("bot_id"), Bot.api_key == bindparam("api_key"))
+    .limit(1)
+)
+
+# Avatar filenames embed a content hash, so each URL's bytes never change
+AVATAR_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Widget config cache configuration (entries are dropped by admin bot
+# mutations in this process; other workers pick changes up within the TTL)
+CONFIG_CACHE_TTL = 60  # seconds
+CONFIG_CACHE_MAX_SIZE = 1024  # entries
+
+# bot_id -> (expires_at monotonic timestamp, api_key, serialized BotPublicConfig)
+_config_cache: OrderedDict[str, tuple[float, str, bytes]] = OrderedDict()
+
+
+def _get_cached_config(bot_id: str, api_key: str) -> Optional[bytes]:
+    """
+    Get a bot's widget config from the cache if present and not expired.
+
+    The cached entry only counts if it was stored for the same API key.
+
+    Args:
+        bot_id: Bot UUID
+        api_key: Bot API key from the request
+
+    Returns:
+        Cached BotPublicConfig JSON, or None on cache miss
+    """
+    entry = _config_cache.get(bot_id)
+    if entry is None:
+        return None
+
+    expires_at, cached_key, config = entry
+    if expires_at < time.monotonic():
+        _config_cache.pop(bot_id, None)
+        return None
+
+    # A different key is a miss, so it is still checked against the database
+    if cached_key != api_key:
+        return None
+
+    _config_cache.move_to_end(bot_id)
+    return config
+
+
+def _cache_config(bot_id: str, api_key: str, config: bytes) -> None:
+    """
+    Store a bot's widget config in the cache.
+
+    Args:
+        bot_id: Bot UUID
+        api_key: Bot API key the config was validated with
+        config: Serialized public bot configuration
+    """
+    _config_cache[bot_id] = (time.monotonic() + CONFIG_CACHE_TTL, api_key, config)
+    _config_cache.move_to_end(bot_id)
+
+    while len(_config_cache) > CONFIG_CACHE_MAX_SIZE:
+        _config_cache.popitem(last=False)
+
+
+def invalidate_config_cache(bot_id: Optional[str] = None) -> None:
+    """
+    Drop a bot's cached widget config.
+
+    Must be called whenever a bot is updated or deleted, or its API key
+    changes.
+
+    Args:
+        bot_id: Bot UUID to invalidate, or None to clear the whole cache
+    """
+    if bot_id is None:
+        _config_cache.clear()
+    else:
+        _config_cache.pop(bot_id, None)
+
+
+class AvatarStaticFiles(StaticFiles):
+    """
+    Static file server for avatar images with long-lived cache headers.
+
+    StaticFiles streams files via sendfile and handles ETag/304 itself,
+    keeping avatar hits out of the route handlers.
+    """
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        response = await super().get_response(path, scope)
+        if response.status_code in (200, 304):
+            response.headers["Cache-Control"] = AVATAR_CACHE_CONTROL
+        return response
+
 
 @router.get("/avatar/{bot_id}")
-async def get_avatar(bot_id: str):
+async def get_avatar(bot_id: str, request: Request):
     """
     Serve bot avatar image.
 
     Public endpoint (no authentication required) for widget to fetch avatars.
+    The URL is not versioned, so clients must revalidate; an unchanged
+    avatar is answered with 304 Not Modified.
 
     Args:
         bot_id: Bot UUID
+        request: Incoming request (for If-None-Match)
 
     Returns:
-        PNG image file
+        PNG image file (304 if unchanged since the client's ETag)
 
     Raises:
         HTTPException: 404 if avatar not found
     """
-    # Check if avatar exists
-    avatar_dir = Path(settings.upload_path) / "avatars"
-
-    # Find avatar file for this bot (should be {bot_id}_*.png)
-    avatar_files = list(avatar_dir.glob(f"{bot_id}_*.png"))
+    # stat/glob are blocking filesystem calls
+    resolved = await asyncio.to_thread(resolve_avatar, bot_id)
 
-    if not avatar_files:
+    if resolved is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Avatar for bot {bot_id} not found",
         )
 
-    # Get the most recent avatar (in case there are multiple)
-    avatar_path = max(avatar_files, key=lambda p: p.stat().st_mtime)
+    avatar_path, stat_result = resolved
 
-    return FileResponse(
+    # Passing stat_result makes FileResponse compute its ETag up front
+    response = FileResponse(
         path=avatar_path,
         media_type="image/png",
-        headers={"Cache-Control": "public, max-age=3600"},  # Cache for 1 hour
+        stat_result=stat_result,
+        headers={"Cache-Control": "public, no-cache"},  # Always revalidate
     )
 
+    if request.headers.get("if-none-match") == response.headers["etag"]:
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={
+                "ETag": response.headers["etag"],
+                "Cache-Control": response.headers["cache-control"],
+            },
+        )
+
+    return response
+
 
 @router.get("/config/{bot_id}", response_model=BotPublicConfig)
 async def get_bot_config(
@@ -88,23 +211,30 @@ async def get_bot_config(
     """
     logger.info(f"Widget config request for bot: {bot_id}")
 
+    config = _get_cached_config(bot_id, api_key)
+    if config is not None:
+        return Response(content=config, media_type="application/json")
+
     # Validate bot and API key
     result = await db.execute(
-        select(Bot).where(
-            Bot.id == bot_id,
-            Bot.api_key == api_key,
-        )
+        _SELECT_PUBLIC_CONFIG, {"bot_id": bot_id, "api_key": api_key}
     )
-    bot = result.scalar_one_or_none()
+    row = result.first()
 
-    if not bot:
+    if not row:
         logger.warning(f"Invalid bot_id or api_key for config request: {bot_id}")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid bot_id or api_key",
         )
 
-    logger.info(f"Returning config for bot: {bot.name} ({bot_id})")
+    logger.info(f"Returning config for bot: {row.name} ({bot_id})")
+
+    # Return public configuration (BotPublicConfig excludes sensitive fields).
+    # Columns were validated on write, so build the model without
+    # re-validating; serialized once and cached for later hits
+    public_config = BotPublicConfig.model_construct(**row._mapping)
+    config = public_config.model_dump_json().encode()
+    _cache_config(bot_id, api_key, config)
 
-    # Return public configuration (BotPublicConfig excludes sensitive fields)
-    return BotPublicConfig.model_validate(bot)
+    return Response(content=config, media_type="application/json")
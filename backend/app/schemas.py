@@ -6,10 +6,15 @@ Separate from SQLAlchemy models to maintain clean separation of concerns.
 """
 
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Literal, Optional
 
 from pydantic import BaseModel, Field, field_validator
 
+# Fixed-choice fields; Literal is checked in pydantic-core without a regex
+WidgetPosition = Literal["bottom-right", "bottom-left", "bottom-center"]
+SourceType = Literal["url", "text"]
+MessageRole = Literal["user", "assistant"]
+
 
 # =============================================================================
 # Bot Schemas
@@ -24,18 +29,12 @@ class BotBase(BaseModel):
     accent_color: str = Field(
         "#3B82F6", pattern=r"^#[0-9A-Fa-f]{6}$", description="Hex color code"
     )
-    position: str = Field(
-        "bottom-right",
-        pattern=r"^(bottom-right|bottom-left|bottom-center)$",
-        description="Widget position",
-    )
+    position: WidgetPosition = Field("bottom-right", description="Widget position")
     show_button_text: bool = Field(False, description="Show text on chat button")
     button_text: str = Field(
         "Chat with us", min_length=1, max_length=100, description="Chat button text"
     )
-    source_type: Optional[str] = Field(
-        None, pattern=r"^(url|text)$", description="Knowledge source type"
-    )
+    source_type: Optional[SourceType] = Field(None, description="Knowledge source type")
     source_content: Optional[str] = Field(None, description="URL or text content")
     message_limit: int = Field(
         1000, ge=1, le=1000000, description="Monthly message limit"
@@ -54,12 +53,10 @@ class BotUpdate(BaseModel):
     name: Optional[str] = Field(None, min_length=1, max_length=255)
     welcome_message: Optional[str] = None
     accent_color: Optional[str] = Field(None, pattern=r"^#[0-9A-Fa-f]{6}$")
-    position: Optional[str] = Field(
-        None, pattern=r"^(bottom-right|bottom-left|bottom-center)$"
-    )
+    position: Optional[WidgetPosition] = None
     show_button_text: Optional[bool] = None
     button_text: Optional[str] = Field(None, min_length=1, max_length=100)
-    source_type: Optional[str] = Field(None, pattern=r"^(url|text)$")
+    source_type: Optional[SourceType] = None
     source_content: Optional[str] = None
     message_limit: Optional[int] = Field(None, ge=1, le=1000000)
 
@@ -127,7 +124,7 @@ class ConversationResponse(ConversationBase):
 class MessageBase(BaseModel):
     """Base schema for Message."""
 
-    role: str = Field(..., pattern=r"^(user|assistant)$", description="Message role")
+    role: MessageRole = Field(..., description="Message role")
     content: str = Field(..., min_length=1, description="Message content")
 
 
@@ -155,7 +152,7 @@ class MessageResponse(MessageBase):
 class ChatMessage(BaseModel):
     """Schema for a chat message in conversation history."""
 
-    role: str = Field(..., pattern=r"^(user|assistant)$")
+    role: MessageRole
     content: str
 
 
@@ -223,3 +220,4 @@ class HealthResponse(BaseModel):
     service: str
     version: str
     timestamp: str
+    components: dict
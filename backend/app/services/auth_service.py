@@ -4,19 +4,42 @@ Authentication service for admin users.
 Provides password hashing, session token generation, and session management.
 """
 
+import asyncio
 import hashlib
+import logging
+import re
 import secrets
 from datetime import datetime, timedelta
 from typing import Optional
 
 import bcrypt
-from sqlalchemy import select
+from sqlalchemy import bindparam, delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.config import get_settings
+from app.config import settings
+from app.database import AsyncSessionLocal
 from app.models import AdminSession
 
-settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# bcrypt work factor: 2^10 rounds (~4x cheaper than 12, OWASP's minimum).
+# The admin hash is rebuilt from settings at every startup and only kept
+# in memory, so changing this never invalidates stored hashes.
+BCRYPT_ROUNDS = 10
+
+# Shape of every token from generate_session_token(): 32 random bytes,
+# URL-safe base64 without padding
+_SESSION_TOKEN_PATTERN = re.compile(r"[A-Za-z0-9_-]{43}")
+
+# Expired sessions are deleted in the background every few minutes
+SESSION_CLEANUP_INTERVAL = 300  # seconds
+
+# Looked up on every authenticated admin request; built once at import.
+# Expiry is checked in SQL, so expired rows are never loaded
+_SELECT_SESSION_BY_TOKEN = select(AdminSession).where(
+    AdminSession.token_hash == bindparam("token_hash"),
+    AdminSession.expires_at > bindparam("now"),
+)
 
 
 def hash_password(password: str) -> str:
@@ -36,7 +59,7 @@ def hash_password(password: str) -> str:
     password_bytes = password.encode('utf-8')[:72]
 
     # Generate salt and hash password
-    salt = bcrypt.gensalt(rounds=12)
+    salt = bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
     hashed = bcrypt.hashpw(password_bytes, salt)
 
     return hashed.decode('utf-8')
@@ -115,7 +138,6 @@ async def create_admin_session(
 
     db.add(session)
     await db.commit()
-    await db.refresh(session)
 
     return session
 
@@ -133,23 +155,19 @@ async def get_session_by_token(
     Returns:
         AdminSession if found and valid, None otherwise
     """
+    # Malformed tokens can't match any session; skip hashing and the query
+    if not _SESSION_TOKEN_PATTERN.fullmatch(token):
+        return None
+
     token_hash = hash_token(token)
 
+    # Expired sessions are treated as missing; run_session_cleanup()
+    # deletes them later, keeping this lookup read-only
     result = await db.execute(
-        select(AdminSession).where(AdminSession.token_hash == token_hash)
+        _SELECT_SESSION_BY_TOKEN,
+        {"token_hash": token_hash, "now": datetime.utcnow()},
     )
-    session = result.scalar_one_or_none()
-
-    # Check if session exists and is not expired
-    if session and session.expires_at > datetime.utcnow():
-        return session
-
-    # Clean up expired session if found
-    if session:
-        await db.delete(session)
-        await db.commit()
-
-    return None
+    return result.scalar_one_or_none()
 
 
 async def delete_session(db: AsyncSession, session_id: str) -> bool:
@@ -163,11 +181,12 @@ async def delete_session(db: AsyncSession, session_id: str) -> bool:
     Returns:
         True if deleted, False if not found
     """
-    result = await db.execute(select(AdminSession).where(AdminSession.id == session_id))
-    session = result.scalar_one_or_none()
+    result = await db.execute(
+        delete(AdminSession).where(AdminSession.id == session_id),
+        execution_options={"synchronize_session": False},
+    )
 
-    if session:
-        await db.delete(session)
+    if result.rowcount:
         await db.commit()
         return True
 
@@ -184,14 +203,28 @@ async def cleanup_expired_sessions(db: AsyncSession) -> int:
     Returns:
         Number of sessions deleted
     """
+    # One bulk DELETE instead of loading and deleting each session
     result = await db.execute(
-        select(AdminSession).where(AdminSession.expires_at < datetime.utcnow())
+        delete(AdminSession).where(AdminSession.expires_at < datetime.utcnow()),
+        execution_options={"synchronize_session": False},
     )
-    expired_sessions = result.scalars().all()
-
-    count = len(expired_sessions)
-    for session in expired_sessions:
-        await db.delete(session)
 
     await db.commit()
-    return count
+    return result.rowcount
+
+
+async def run_session_cleanup() -> None:
+    """
+    Delete expired admin sessions every SESSION_CLEANUP_INTERVAL seconds.
+
+    Runs until cancelled; started from the app lifespan.
+    """
+    while True:
+        await asyncio.sleep(SESSION_CLEANUP_INTERVAL)
+        try:
+            async with AsyncSessionLocal() as db:
+                removed = await cleanup_expired_sessions(db)
+            if removed:
+                logger.info(f"Deleted {removed} expired admin sessions")
+        except Exception as e:
+            logger.error(f"Failed to clean up expired sessions: {e}")
@@ -0,0 +1,122 @@
+"""
+In-memory index of avatar files by bot id.
+
+Lets the legacy /api/public/avatar/{bot_id} route find a bot's avatar
+without scanning the avatars directory on every request. The index is
+built once at startup and updated by the admin avatar routes; changes
+made by other workers are picked up because replacing or deleting an
+avatar unlinks the indexed file, which sends the lookup back to disk.
+
+Bots without an avatar are remembered for MISSING_TTL seconds so their
+requests don't rescan the directory; the TTL bounds how long an avatar
+uploaded through another worker stays invisible here.
+"""
+
+import logging
+import os
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+MISSING_TTL = 30.0  # seconds
+MISSING_MAX_SIZE = 1024
+
+# bot_id -> newest avatar file for that bot
+_index: dict[str, Path] = {}
+
+# bot_id -> expires_at (monotonic) for bots known to have no avatar
+_missing: OrderedDict[str, float] = OrderedDict()
+
+
+def build_index() -> int:
+    """
+    Index the avatars directory with a single scandir pass.
+
+    Blocking (filesystem); called once during startup.
+
+    Returns:
+        Number of bots with an avatar
+    """
+    newest: dict[str, tuple[float, str]] = {}
+
+    with os.scandir(settings.avatar_dir) as entries:
+        for entry in entries:
+            # Avatar files are named {bot_id}_{suffix}.png
+            bot_id, sep, _ = entry.name.partition("_")
+            if not sep or not entry.name.endswith(".png"):
+                continue
+
+            mtime = entry.stat().st_mtime
+            if bot_id not in newest or mtime > newest[bot_id][0]:
+                newest[bot_id] = (mtime, entry.path)
+
+    _index.clear()
+    _missing.clear()
+    _index.update((bot_id, Path(path)) for bot_id, (_, path) in newest.items())
+
+    logger.info(f"Indexed avatars for {len(_index)} bots")
+    return len(_index)
+
+
+def set_avatar(bot_id: str, path: Path) -> None:
+    """Record a bot's newly written avatar file."""
+    _index[bot_id] = path
+    _missing.pop(bot_id, None)
+
+
+def remove_avatar(bot_id: str) -> None:
+    """Forget a bot's avatar after it has been deleted."""
+    _index.pop(bot_id, None)
+
+
+def resolve_avatar(bot_id: str) -> Optional[tuple[Path, os.stat_result]]:
+    """
+    Find a bot's current avatar file.
+
+    An indexed path costs one stat() to confirm it still exists. Bots
+    missing from the index (or whose file is gone) fall back to a glob,
+    since another worker may have written a new avatar; a glob that finds
+    nothing is cached for MISSING_TTL seconds.
+
+    Blocking (filesystem).
+
+    Args:
+        bot_id: Bot UUID
+
+    Returns:
+        Tuple of (avatar path, its stat result), or None if there is none
+    """
+    avatar_path = _index.get(bot_id)
+    if avatar_path is not None:
+        try:
+            return avatar_path, avatar_path.stat()
+        except FileNotFoundError:
+            _index.pop(bot_id, None)
+
+    # Recently found to have no avatar
+    expires_at = _missing.get(bot_id)
+    if expires_at is not None:
+        if expires_at > time.monotonic():
+            return None
+        _missing.pop(bot_id, None)
+
+    # Find avatar file for this bot (should be {bot_id}_*.png)
+    avatar_files = list(settings.avatar_dir.glob(f"{bot_id}_*.png"))
+    if not avatar_files:
+        _missing[bot_id] = time.monotonic() + MISSING_TTL
+        while len(_missing) > MISSING_MAX_SIZE:
+            _missing.popitem(last=False)
+        return None
+
+    # Get the most recent avatar (in case there are multiple)
+    stat, avatar_path = max(
+        ((p.stat(), p) for p in avatar_files), key=lambda item: item[0].st_mtime
+    )
+    _index[bot_id] = avatar_path
+
+    return avatar_path, stat
@@ -8,16 +8,17 @@ Provides intelligent chatbot responses by:
 """
 
 import logging
-from typing import AsyncGenerator, List
+from typing import TYPE_CHECKING, AsyncGenerator, List, Optional
 
-from openai import AsyncOpenAI
-
-from app.config import get_settings
-from app.models import Bot, Message
+from app.config import settings
+from app.dependencies import BotAuthInfo
+from app.models import Message
 from app.services.embeddings import generate_query_embedding
 from app.services.qdrant_client import search_vectors
 
-settings = get_settings()
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
 logger = logging.getLogger(__name__)
 
 # OpenAI client singleton (reuse from embeddings service)
@@ -29,19 +30,32 @@ MAX_CONTEXT_CHUNKS = 3  # Top N chunks to include in context
 SIMILARITY_THRESHOLD = 0.6  # Minimum similarity score
 MAX_CONVERSATION_HISTORY = 10  # Last N messages to include
 
+# Fixed tail of every system prompt; only the bot name and context vary
+SYSTEM_PROMPT_INSTRUCTIONS = """Instructions:
+- Answer the user's question using ONLY the context provided above
+- Be helpful, concise, and friendly
+- If the answer is not in the context, respond: "I don't have that information in my knowledge base. Please contact our support team for assistance."
+- Do not make up information or use knowledge outside the provided context
+- If multiple pieces of context are relevant, synthesize them into a coherent answer
+"""
+
 
-def get_openai_client() -> AsyncOpenAI:
+def get_openai_client() -> "AsyncOpenAI":
     """Get or create OpenAI client singleton."""
     global _openai_client
 
     if _openai_client is None:
+        # Deferred import: the openai package is slow to import and only
+        # needed once the first request reaches the API
+        from openai import AsyncOpenAI
+
         _openai_client = AsyncOpenAI(api_key=settings.openai_api_key)
         logger.info("OpenAI client initialized for chat")
 
     return _openai_client
 
 
-def build_system_prompt(bot: Bot, context_chunks: List[dict]) -> str:
+def build_system_prompt(bot: BotAuthInfo, context_chunks: List[dict]) -> str:
     """
     Build system prompt with bot context and retrieved knowledge.
 
@@ -57,26 +71,18 @@ def build_system_prompt(bot: Bot, context_chunks: List[dict]) -> str:
     # Build context section from retrieved chunks
     context_text = ""
     if context_chunks:
-        context_text = "Context from knowledge base:\n\n"
+        parts = ["Context from knowledge base:\n\n"]
         for i, chunk in enumerate(context_chunks, 1):
             text = chunk["payload"].get("text", "")
             score = chunk.get("score", 0)
-            context_text += f"[{i}] (relevance: {score:.2f})\n{text}\n\n"
+            parts.append(f"[{i}] (relevance: {score:.2f})\n{text}\n\n")
+        context_text = "".join(parts)
 
     # Build system prompt
-    prompt = f"""You are {bot_name}, a helpful customer support assistant.
-
-{context_text}
-
-Instructions:
-- Answer the user's question using ONLY the context provided above
-- Be helpful, concise, and friendly
-- If the answer is not in the context, respond: "I don't have that information in my knowledge base. Please contact our support team for assistance."
-- Do not make up information or use knowledge outside the provided context
-- If multiple pieces of context are relevant, synthesize them into a coherent answer
-"""
-
-    return prompt
+    return (
+        f"You are {bot_name}, a helpful customer support assistant.\n\n"
+        f"{context_text}\n\n{SYSTEM_PROMPT_INSTRUCTIONS}"
+    )
 
 
 def build_messages(
@@ -144,9 +150,10 @@ async def retrieve_context(bot_id: str, question: str) -> List[dict]:
 
 
 async def generate_response(
-    bot: Bot,
+    bot: BotAuthInfo,
     question: str,
     conversation_history: List[Message],
+    context_chunks: Optional[List[dict]] = None,
 ) -> AsyncGenerator[str, None]:
     """
     Generate streaming chat response using RAG.
@@ -155,6 +162,7 @@ async def generate_response(
         bot: Bot configuration
         question: User question
         conversation_history: Previous messages in conversation
+        context_chunks: Already retrieved context (retrieved here if None)
 
     Yields:
         Response tokens as they are generated
@@ -162,7 +170,8 @@ async def generate_response(
     logger.info(f"Generating response for bot {bot.id} ({bot.name})")
 
     # Retrieve relevant context
-    context_chunks = await retrieve_context(bot.id, question)
+    if context_chunks is None:
+        context_chunks = await retrieve_context(bot.id, question)
 
     # Build system prompt with context
     system_prompt = build_system_prompt(bot, context_chunks)
@@ -7,7 +7,7 @@ Implements sentence-aware splitting to avoid breaking mid-sentence.
 
 import logging
 import re
-from typing import List
+from typing import Iterator, List
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +16,10 @@ CHUNK_SIZE = 500  # Target tokens per chunk (approx)
 CHUNK_OVERLAP = 50  # Overlap between chunks (approx tokens)
 CHARS_PER_TOKEN = 4  # Rough estimate: 1 token ≈ 4 characters
 
+# Sentence endings: . ! ? followed by space/newline/end, with negative
+# lookbehinds for common abbreviations. Compiled once at import
+_SENTENCE_BOUNDARY = re.compile(r'(?<!\w\.\w.)(?<![A-Z][a-z]\.)(?<=\.|\?|!)\s+')
+
 
 def estimate_tokens(text: str) -> int:
     """
@@ -45,55 +49,49 @@ def split_into_sentences(text: str) -> List[str]:
     Returns:
         List of sentences
     """
-    # Pattern matches sentence endings: . ! ? followed by space/newline/end
-    # Negative lookbehind for common abbreviations
-    sentence_pattern = r'(?<!\w\.\w.)(?<![A-Z][a-z]\.)(?<=\.|\?|!)\s+'
-
-    sentences = re.split(sentence_pattern, text)
-
-    # Filter out empty sentences and strip whitespace
-    sentences = [s.strip() for s in sentences if s.strip()]
+    sentences = _SENTENCE_BOUNDARY.split(text)
 
-    return sentences
+    # Strip whitespace and filter out empty sentences (stripping once each)
+    return [s for s in map(str.strip, sentences) if s]
 
 
-def create_chunks(text: str) -> List[dict]:
+def create_chunks(text: str) -> Iterator[dict]:
     """
     Split text into overlapping chunks.
 
     Creates chunks of approximately CHUNK_SIZE tokens with CHUNK_OVERLAP
     overlap. Respects sentence boundaries to avoid breaking mid-sentence.
+    Chunks are yielded as soon as they are complete, so consumers don't
+    have to hold every chunk of a large document at once.
 
     Args:
         text: Text to chunk
 
-    Returns:
-        List of chunk dictionaries with keys:
+    Yields:
+        Chunk dictionaries with keys:
             - text: Chunk text content
             - index: Chunk index (0-based)
             - token_count: Estimated token count
     """
     if not text or not text.strip():
         logger.warning("Empty text provided for chunking")
-        return []
+        return
 
     # Split into sentences
     sentences = split_into_sentences(text)
 
     if not sentences:
         logger.warning("No sentences found in text")
-        return []
+        return
 
     logger.info(f"Split text into {len(sentences)} sentences")
 
-    chunks = []
+    chunk_count = 0
+    total_tokens = 0
     current_chunk = []
+    current_sizes = []  # Token estimate of each sentence in current_chunk
     current_tokens = 0
 
-    # Target sizes in characters
-    target_chunk_chars = CHUNK_SIZE * CHARS_PER_TOKEN
-    overlap_chars = CHUNK_OVERLAP * CHARS_PER_TOKEN
-
     for i, sentence in enumerate(sentences):
         sentence_tokens = estimate_tokens(sentence)
 
@@ -103,64 +101,70 @@ def create_chunks(text: str) -> List[dict]:
                 f"Sentence {i} is very long ({sentence_tokens} tokens), "
                 f"will create oversized chunk"
             )
-            chunks.append({
+            yield {
                 "text": sentence,
-                "index": len(chunks),
+                "index": chunk_count,
                 "token_count": sentence_tokens,
-            })
+            }
+            chunk_count += 1
+            total_tokens += sentence_tokens
             continue
 
         # Check if adding this sentence would exceed chunk size
         if current_tokens + sentence_tokens > CHUNK_SIZE and current_chunk:
-            # Save current chunk
+            # Emit current chunk
             chunk_text = " ".join(current_chunk)
-            chunks.append({
+            chunk_tokens = estimate_tokens(chunk_text)
+            yield {
                 "text": chunk_text,
-                "index": len(chunks),
-                "token_count": estimate_tokens(chunk_text),
-            })
+                "index": chunk_count,
+                "token_count": chunk_tokens,
+            }
+            chunk_count += 1
+            total_tokens += chunk_tokens
 
             # Start new chunk with overlap
-            # Keep last few sentences for overlap
-            overlap_text = ""
+            # Keep last few sentences (up to CHUNK_OVERLAP tokens) for overlap
+            overlap_count = 0
             overlap_tokens = 0
 
-            for prev_sentence in reversed(current_chunk):
-                sentence_tokens_overlap = estimate_tokens(prev_sentence)
-                if overlap_tokens + sentence_tokens_overlap <= CHUNK_OVERLAP:
-                    overlap_text = prev_sentence + " " + overlap_text
-                    overlap_tokens += sentence_tokens_overlap
-                else:
+            for prev_tokens in reversed(current_sizes):
+                if overlap_tokens + prev_tokens > CHUNK_OVERLAP:
                     break
+                overlap_count += 1
+                overlap_tokens += prev_tokens
 
             # Start new chunk with overlap sentences
-            if overlap_text:
-                current_chunk = [s for s in current_chunk if s in overlap_text]
-                current_tokens = overlap_tokens
+            if overlap_count:
+                current_chunk = current_chunk[-overlap_count:]
+                current_sizes = current_sizes[-overlap_count:]
             else:
                 current_chunk = []
-                current_tokens = 0
+                current_sizes = []
+            current_tokens = overlap_tokens
 
         # Add sentence to current chunk
         current_chunk.append(sentence)
+        current_sizes.append(sentence_tokens)
         current_tokens += sentence_tokens
 
-    # Add final chunk if it has content
+    # Emit final chunk if it has content
     if current_chunk:
         chunk_text = " ".join(current_chunk)
-        chunks.append({
+        chunk_tokens = estimate_tokens(chunk_text)
+        yield {
             "text": chunk_text,
-            "index": len(chunks),
-            "token_count": estimate_tokens(chunk_text),
-        })
+            "index": chunk_count,
+            "token_count": chunk_tokens,
+        }
+        chunk_count += 1
+        total_tokens += chunk_tokens
 
     logger.info(
-        f"Created {len(chunks)} chunks "
-        f"(avg {sum(c['token_count'] for c in chunks) / len(chunks):.0f} tokens/chunk)"
+        f"Created {chunk_count} chunks "
+        f"(avg {total_tokens / chunk_count:.0f} tokens/chunk)"
     )
 
-    return chunks
-
 
 def chunk_text(text: str, source: str = "") -> List[dict]:
     """
@@ -175,11 +179,11 @@ def chunk_text(text: str, source: str = "") -> List[dict]:
     """
     logger.info(f"Chunking text from source: {source or 'direct input'}")
 
-    chunks = create_chunks(text)
-
-    # Add source metadata
-    for chunk in chunks:
+    # Add source metadata as the chunks are produced
+    chunks = []
+    for chunk in create_chunks(text):
         chunk["source"] = source
+        chunks.append(chunk)
 
     logger.info(f"Chunking complete: {len(chunks)} chunks created")
 
@@ -5,16 +5,19 @@ Integrates with OpenAI API for text-embedding-3-small and stores
 embeddings in Qdrant vector database.
 """
 
+import asyncio
 import logging
 import uuid
-from typing import List
+from array import array
+from collections import OrderedDict
+from typing import TYPE_CHECKING, List
 
-from openai import AsyncOpenAI
+from app.config import settings
+from app.services.qdrant_client import delete_vectors, upsert_vectors
 
-from app.config import get_settings
-from app.services.qdrant_client import upsert_vectors
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
 
-settings = get_settings()
 logger = logging.getLogger(__name__)
 
 # OpenAI client singleton
@@ -24,9 +27,15 @@ _openai_client = None
 EMBEDDING_MODEL = "text-embedding-3-small"
 EMBEDDING_DIMENSION = 1536
 BATCH_SIZE = 100  # Max embeddings per API request
+EMBED_CONCURRENCY = 4  # Embedding requests in flight per ingest
+QUERY_EMBEDDING_CACHE_SIZE = 1024
 
+# query text -> embedding; the API returns float32 values, so array("f")
+# holds them exactly in ~6KB instead of ~50KB as a list of floats
+_query_embedding_cache: OrderedDict[str, array] = OrderedDict()
 
-def get_openai_client() -> AsyncOpenAI:
+
+def get_openai_client() -> "AsyncOpenAI":
     """
     Get or create OpenAI client singleton.
 
@@ -36,78 +45,58 @@ def get_openai_client() -> AsyncOpenAI:
     global _openai_client
 
     if _openai_client is None:
+        # Deferred import: the openai package is slow to import and only
+        # needed once the first request reaches the API
+        from openai import AsyncOpenAI
+
         _openai_client = AsyncOpenAI(api_key=settings.openai_api_key)
         logger.info("OpenAI client initialized")
 
     return _openai_client
 
 
-async def generate_embeddings(texts: List[str]) -> List[List[float]]:
+async def _create_embeddings(texts: List[str]) -> List[List[float]]:
     """
-    Generate embeddings for a list of texts using OpenAI.
-
-    Processes texts in batches to respect API limits.
+    Embed one batch of texts with a single OpenAI API request.
 
     Args:
-        texts: List of text strings to embed
+        texts: Up to BATCH_SIZE texts
 
     Returns:
-        List of embedding vectors (each 1536 dimensions)
+        Embedding vectors in input order
 
     Raises:
-        Exception: If OpenAI API call fails
+        ValueError: If the API returns the wrong number of embeddings
     """
-    if not texts:
-        logger.warning("Empty text list provided for embedding")
-        return []
-
-    client = get_openai_client()
-    all_embeddings = []
+    response = await get_openai_client().embeddings.create(
+        model=EMBEDDING_MODEL,
+        input=texts,
+    )
 
-    # Process in batches
-    for i in range(0, len(texts), BATCH_SIZE):
-        batch = texts[i : i + BATCH_SIZE]
-        batch_num = i // BATCH_SIZE + 1
-        total_batches = (len(texts) + BATCH_SIZE - 1) // BATCH_SIZE
-
-        logger.info(
-            f"Generating embeddings for batch {batch_num}/{total_batches} "
-            f"({len(batch)} texts)"
+    embeddings = [item.embedding for item in response.data]
+    if len(embeddings) != len(texts):
+        raise ValueError(
+            f"Embedding count mismatch: got {len(embeddings)}, expected {len(texts)}"
         )
-
-        try:
-            response = await client.embeddings.create(
-                model=EMBEDDING_MODEL,
-                input=batch,
-            )
-
-            # Extract embeddings in order
-            batch_embeddings = [item.embedding for item in response.data]
-            all_embeddings.extend(batch_embeddings)
-
-            logger.info(
-                f"Generated {len(batch_embeddings)} embeddings "
-                f"(total: {len(all_embeddings)}/{len(texts)})"
-            )
-
-        except Exception as e:
-            logger.error(f"Failed to generate embeddings for batch {batch_num}: {e}")
-            raise
-
-    logger.info(f"Successfully generated {len(all_embeddings)} embeddings")
-    return all_embeddings
+    return embeddings
 
 
 async def embed_and_store(
     bot_id: str,
     chunks: List[dict],
+    replace: bool = False,
 ) -> int:
     """
     Generate embeddings for chunks and store in Qdrant.
 
+    Embedding batches are requested concurrently (up to EMBED_CONCURRENCY
+    at a time) and each batch is upserted as soon as it arrives, so
+    storage overlaps with the remaining API calls.
+
     Args:
         bot_id: Bot UUID
         chunks: List of chunk dictionaries with 'text', 'index', 'source', etc.
+        replace: Delete the bot's existing vectors before storing the new ones
 
     Returns:
         Number of vectors stored
@@ -121,44 +110,72 @@ async def embed_and_store(
 
     logger.info(f"Embedding and storing {len(chunks)} chunks for bot {bot_id}")
 
-    # Extract texts for embedding
-    texts = [chunk["text"] for chunk in chunks]
-
-    # Generate embeddings
-    embeddings = await generate_embeddings(texts)
-
-    if len(embeddings) != len(chunks):
-        raise ValueError(
-            f"Embedding count mismatch: got {len(embeddings)}, expected {len(chunks)}"
-        )
+    semaphore = asyncio.Semaphore(EMBED_CONCURRENCY)
 
-    # Prepare vectors for Qdrant
-    vectors = []
-    for i, (chunk, embedding) in enumerate(zip(chunks, embeddings)):
-        point_id = str(uuid.uuid4())
+    async def embed_batch(start: int) -> tuple[int, List[List[float]]]:
+        batch = [chunk["text"] for chunk in chunks[start : start + BATCH_SIZE]]
+        async with semaphore:
+            return start, await _create_embeddings(batch)
 
-        payload = {
-            "text": chunk["text"],
-            "chunk_index": chunk.get("index", i),
-            "source": chunk.get("source", ""),
-            "token_count": chunk.get("token_count", 0),
-        }
+    # Send the embedding requests first: the Qdrant client is synchronous,
+    # so the delete then runs while they are in flight
+    embed_tasks = [
+        asyncio.create_task(embed_batch(start))
+        for start in range(0, len(chunks), BATCH_SIZE)
+    ]
+    delete_task = asyncio.create_task(delete_vectors(bot_id)) if replace else None
 
-        vectors.append((point_id, embedding, payload))
-
-    # Store in Qdrant
-    await upsert_vectors(bot_id, vectors)
+    stored = 0
+    try:
+        # Old vectors must be gone before any new ones are stored
+        if delete_task is not None:
+            await delete_task
+
+        for next_batch in asyncio.as_completed(embed_tasks):
+            start, embeddings = await next_batch
+
+            # Prepare ids and payloads for Qdrant
+            ids = []
+            payloads = []
+            for i in range(start, start + len(embeddings)):
+                chunk = chunks[i]
+                # Qdrant accepts the undashed form; point ids are never read back
+                ids.append(uuid.uuid4().hex)
+                payloads.append(
+                    {
+                        "text": chunk["text"],
+                        "chunk_index": chunk.get("index", i),
+                        "source": chunk.get("source", ""),
+                        "token_count": chunk.get("token_count", 0),
+                    }
+                )
+
+            # Store in Qdrant
+            await upsert_vectors(bot_id, ids, embeddings, payloads)
+            stored += len(ids)
+
+            logger.info(f"Stored {stored}/{len(chunks)} vectors for bot {bot_id}")
+
+    except BaseException as e:
+        for task in embed_tasks:
+            task.cancel()
+        if delete_task is not None:
+            delete_task.cancel()
+        if isinstance(e, Exception):
+            logger.error(f"Failed to embed and store chunks for bot {bot_id}: {e}")
+        raise
 
-    logger.info(f"Successfully stored {len(vectors)} vectors for bot {bot_id}")
+    logger.info(f"Successfully stored {stored} vectors for bot {bot_id}")
 
-    return len(vectors)
+    return stored
 
 
 async def generate_query_embedding(query: str) -> List[float]:
     """
     Generate embedding for a query string.
 
-    Used for searching similar chunks during chat.
+    Used for searching similar chunks during chat. The most recent
+    QUERY_EMBEDDING_CACHE_SIZE queries are cached in memory.
 
     Args:
         query: Query text
@@ -169,6 +186,12 @@ async def generate_query_embedding(query: str) -> List[float]:
     Raises:
         Exception: If OpenAI API call fails
     """
+    # Repeated questions (FAQs, retries) skip the API round trip
+    cached = _query_embedding_cache.get(query)
+    if cached is not None:
+        _query_embedding_cache.move_to_end(query)
+        return cached.tolist()
+
     logger.info(f"Generating query embedding: {query[:100]}...")
 
     client = get_openai_client()
@@ -181,6 +204,10 @@ async def generate_query_embedding(query: str) -> List[float]:
 
         embedding = response.data[0].embedding
 
+        _query_embedding_cache[query] = array("f", embedding)
+        while len(_query_embedding_cache) > QUERY_EMBEDDING_CACHE_SIZE:
+            _query_embedding_cache.popitem(last=False)
+
         logger.info("Query embedding generated successfully")
         return embedding
 
@@ -5,6 +5,7 @@ Provides initialization and management of Qdrant collections for storing
 and retrieving embeddings with bot-specific filtering.
 """
 
+import asyncio
 import logging
 from typing import Optional
 
@@ -12,10 +13,9 @@ from qdrant_client import QdrantClient
 from qdrant_client.http import models
 from qdrant_client.http.exceptions import UnexpectedResponse
 
-from app.config import get_settings
+from app.config import settings
 
 logger = logging.getLogger(__name__)
-settings = get_settings()
 
 # Global client instance
 _qdrant_client: Optional[QdrantClient] = None
@@ -25,6 +25,17 @@ COLLECTION_NAME = "chirp_embeddings"
 VECTOR_SIZE = 1536  # OpenAI text-embedding-3-small dimension
 DISTANCE_METRIC = models.Distance.COSINE
 
+# Rescore twice the requested number of quantized matches with the
+# original vectors, so int8 rounding doesn't change the results
+SEARCH_PARAMS = models.SearchParams(
+    quantization=models.QuantizationSearchParams(rescore=True, oversampling=2.0),
+)
+
+# Server-mode upserts are sent in slices, a few at a time, off the event loop
+UPSERT_BATCH_SIZE = 64
+UPSERT_CONCURRENCY = 2
+_upsert_semaphore = asyncio.Semaphore(UPSERT_CONCURRENCY)
+
 
 def get_qdrant_client() -> QdrantClient:
     """
@@ -91,6 +102,19 @@ async def init_collection() -> None:
                 size=VECTOR_SIZE,
                 distance=DISTANCE_METRIC,
             ),
+            # Every search filters by bot_id, so skip the collection-wide
+            # HNSW graph and build per-bot graphs instead; ingests then
+            # only index the bot being loaded
+            hnsw_config=models.HnswConfigDiff(payload_m=16, m=0),
+            # int8 copies of the vectors (4x smaller) are scanned during
+            # search; the top candidates are rescored with the originals
+            quantization_config=models.ScalarQuantization(
+                scalar=models.ScalarQuantizationConfig(
+                    type=models.ScalarType.INT8,
+                    quantile=0.99,
+                    always_ram=True,
+                ),
+            ),
         )
 
         # Create payload index for bot_id filtering
@@ -98,7 +122,10 @@ async def init_collection() -> None:
         client.create_payload_index(
             collection_name=COLLECTION_NAME,
             field_name="bot_id",
-            field_schema=models.PayloadSchemaType.KEYWORD,
+            field_schema=models.KeywordIndexParams(
+                type=models.KeywordIndexType.KEYWORD,
+                is_tenant=True,
+            ),
         )
 
         logger.info(f"Collection '{COLLECTION_NAME}' created successfully")
@@ -142,19 +169,32 @@ async def health_check() -> dict:
         }
 
 
+async def _upsert_batch(client: QdrantClient, points: models.Batch) -> None:
+    """Upsert one slice of points in a worker thread (server mode only)."""
+    async with _upsert_semaphore:
+        await asyncio.to_thread(
+            client.upsert,
+            collection_name=COLLECTION_NAME,
+            points=points,
+            wait=True,
+        )
+
+
 async def upsert_vectors(
     bot_id: str,
-    vectors: list[tuple[str, list[float], dict]],
+    ids: list[str],
+    embeddings: list[list[float]],
+    payloads: list[dict],
 ) -> None:
     """
     Upsert vectors into Qdrant collection.
 
     Args:
         bot_id: Bot UUID for filtering
-        vectors: List of tuples (point_id, embedding, payload)
-            - point_id: Unique identifier for the vector (UUID string)
-            - embedding: Vector embeddings (list of 1536 floats)
-            - payload: Additional metadata (dict)
+        ids: Unique identifier for each vector (UUID strings)
+        embeddings: Vector embeddings (lists of 1536 floats), parallel to ids
+        payloads: Additional metadata, parallel to ids; bot_id is added
+            to each dict in place
 
     Raises:
         Exception: If upsert operation fails
@@ -162,27 +202,35 @@ async def upsert_vectors(
     client = get_qdrant_client()
 
     try:
-        # Prepare points for upsert
-        points = []
-        for point_id, embedding, payload in vectors:
-            # Merge bot_id into payload
-            full_payload = {"bot_id": bot_id, **payload}
-
-            points.append(
-                models.PointStruct(
-                    id=point_id,
-                    vector=embedding,
-                    payload=full_payload,
+        # Tag each point with its bot for filtering
+        for payload in payloads:
+            payload["bot_id"] = bot_id
+
+        if settings.use_qdrant_server:
+            # Concurrent slices overlap network and server-side indexing;
+            # wait=True returns only once each slice is applied, so errors
+            # surface here and searches right after ingest see every point
+            await asyncio.gather(
+                *(
+                    _upsert_batch(
+                        client,
+                        models.Batch(
+                            ids=ids[start : start + UPSERT_BATCH_SIZE],
+                            vectors=embeddings[start : start + UPSERT_BATCH_SIZE],
+                            payloads=payloads[start : start + UPSERT_BATCH_SIZE],
+                        ),
+                    )
+                    for start in range(0, len(ids), UPSERT_BATCH_SIZE)
                 )
             )
+        else:
+            # Local mode isn't thread-safe, so it stays on the event loop
+            client.upsert(
+                collection_name=COLLECTION_NAME,
+                points=models.Batch(ids=ids, vectors=embeddings, payloads=payloads),
+            )
 
-        # Upsert points
-        client.upsert(
-            collection_name=COLLECTION_NAME,
-            points=points,
-        )
-
-        logger.info(f"Upserted {len(points)} vectors for bot {bot_id}")
+        logger.info(f"Upserted {len(ids)} vectors for bot {bot_id}")
 
     except Exception as e:
         logger.error(f"Failed to upsert vectors: {e}")
@@ -230,6 +278,8 @@ async def search_vectors(
             ),
             limit=limit,
             score_threshold=similarity_threshold,
+            # Local mode is always exact and warns about search params
+            search_params=SEARCH_PARAMS if settings.use_qdrant_server else None,
         )
 
         # Format results
@@ -0,0 +1,164 @@
+"""
+Per-session chat rate limiting.
+
+Uses a Redis fixed-window counter when REDIS_URL is configured, so the
+limit holds across all workers. Without Redis, falls back to an
+in-process sliding window (per worker).
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Optional
+
+from app.config import settings
+
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
+
+logger = logging.getLogger(__name__)
+
+# Rate limiting configuration
+RATE_LIMIT_WINDOW = 60  # seconds
+MAX_MESSAGES_PER_WINDOW = 10  # messages per session per window
+RATE_LIMIT_MESSAGE = (
+    f"Rate limit exceeded: max {MAX_MESSAGES_PER_WINDOW} messages "
+    f"per {RATE_LIMIT_WINDOW} seconds"
+)
+
+# Global Redis client instance (only used when settings.redis_url is set)
+_redis_client: Optional["Redis"] = None
+
+# In-process fallback: session_id -> monotonic timestamps of recent messages
+_local_windows: dict[str, deque[float]] = {}
+
+
+def get_redis_client() -> "Redis":
+    """Get or create Redis client singleton."""
+    global _redis_client
+
+    if _redis_client is None:
+        from redis.asyncio import Redis
+
+        _redis_client = Redis.from_url(settings.redis_url)
+        logger.info("Redis client initialized for rate limiting")
+
+    return _redis_client
+
+
+async def check_rate_limit(session_id: str) -> tuple[bool, Optional[str]]:
+    """
+    Check if session has exceeded rate limit, counting this request.
+
+    Args:
+        session_id: Session identifier
+
+    Returns:
+        Tuple of (is_allowed, error_message)
+    """
+    if settings.redis_url:
+        allowed = await _check_redis(session_id)
+    else:
+        allowed = _check_local(session_id)
+
+    return (True, None) if allowed else (False, RATE_LIMIT_MESSAGE)
+
+
+async def _check_redis(session_id: str) -> bool:
+    """
+    Fixed-window counter: INCR a per-window key that expires with the window.
+
+    Fails open (allows the request) if Redis is unreachable.
+    """
+    window = int(time.time()) // RATE_LIMIT_WINDOW
+    key = f"rl:{session_id}:{window}"
+
+    try:
+        async with get_redis_client().pipeline(transaction=True) as pipe:
+            pipe.incr(key)
+            # The key is per-window, so re-arming its TTL on every INCR is
+            # harmless (EXPIRE ... NX would require Redis 7)
+            pipe.expire(key, RATE_LIMIT_WINDOW)
+            count, _ = await pipe.execute()
+    except Exception as e:
+        logger.error(f"Rate limit check failed, allowing request: {e}")
+        return True
+
+    return count <= MAX_MESSAGES_PER_WINDOW
+
+
+def _check_local(session_id: str) -> bool:
+    """
+    Sliding window over the last MAX_MESSAGES_PER_WINDOW timestamps.
+
+    The deque keeps only the newest N entries, so the session is over the
+    limit exactly when it is full and its oldest entry is still in the
+    window: an O(1) check with no pruning.
+    """
+    now = time.monotonic()
+
+    timestamps = _local_windows.get(session_id)
+    if timestamps is None:
+        timestamps = _local_windows[session_id] = deque(
+            maxlen=MAX_MESSAGES_PER_WINDOW
+        )
+
+    if (
+        len(timestamps) == MAX_MESSAGES_PER_WINDOW
+        and now - timestamps[0] < RATE_LIMIT_WINDOW
+    ):
+        return False
+
+    timestamps.append(now)
+    return True
+
+
+def sweep_local_windows() -> int:
+    """
+    Forget sessions with no requests inside the current window.
+
+    Returns:
+        Number of sessions removed
+    """
+    window_start = time.monotonic() - RATE_LIMIT_WINDOW
+    stale = [
+        session_id
+        for session_id, timestamps in _local_windows.items()
+        if timestamps[-1] <= window_start
+    ]
+    for session_id in stale:
+        del _local_windows[session_id]
+
+    return len(stale)
+
+
+async def run_sweeper() -> None:
+    """
+    Periodically sweep idle sessions from the in-process windows.
+
+    Runs until cancelled; started from the app lifespan.
+    """
+    while True:
+        await asyncio.sleep(RATE_LIMIT_WINDOW)
+        removed = sweep_local_windows()
+        if removed:
+            logger.debug(f"Swept {removed} idle rate limit sessions")
+
+
+async def close_client() -> None:
+    """
+    Close Redis client connection.
+
+    Called during application shutdown to cleanup resources.
+    """
+    global _redis_client
+
+    if _redis_client is not None:
+        try:
+            await _redis_client.aclose()
+            logger.info("Redis client closed")
+        except Exception as e:
+            logger.error(f"Error closing Redis client: {e}")
+        finally:
+            _redis_client = None
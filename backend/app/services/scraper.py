@@ -5,8 +5,15 @@ Fetches and extracts clean text from web pages for embedding generation.
 Implements security measures to prevent SSRF and resource abuse.
 """
 
+import asyncio
+import ipaddress
 import logging
-from typing import Optional
+import socket
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from types import ModuleType
+from typing import AsyncIterator, Optional
 from urllib.parse import urlparse
 
 import httpx
@@ -18,6 +25,22 @@ logger = logging.getLogger(__name__)
 MAX_CONTENT_LENGTH = 10_000_000  # 10MB max response size
 REQUEST_TIMEOUT = 30  # seconds
 MAX_WORDS = 10_000  # Limit extracted text to 10,000 words
+MAX_CONNECTIONS = 10  # Shared client pool size, and scrape_urls concurrency
+MAX_REDIRECTS = 5  # Redirect hops followed (each one re-validated)
+
+# User agent sent with every request to avoid being blocked
+USER_AGENT = "Chirp AI Bot/1.0 (+https://github.com/yourusername/chirp-app)"
+
+# Shared HTTP client: keeps connections (and their TLS sessions) alive
+# between fetches
+_http_client: Optional[httpx.AsyncClient] = None
+
+# url -> (conditional request headers, extracted text) for re-scrapes
+SCRAPE_CACHE_MAX_SIZE = 128
+_scrape_cache: OrderedDict[str, tuple[dict[str, str], str]] = OrderedDict()
+
+# Non-content elements dropped before extracting text
+SKIP_TAGS = ["script", "style", "nav", "header", "footer", "aside"]
 
 # Blocked hosts/IPs to prevent SSRF
 BLOCKED_HOSTS = {
@@ -30,10 +53,55 @@ BLOCKED_HOSTS = {
 }
 
 
+def _parse_ip(host: str) -> Optional[ipaddress.IPv4Address | ipaddress.IPv6Address]:
+    """
+    Parse a hostname that is an IP address literal.
+
+    Besides standard notation this accepts the legacy IPv4 forms that
+    resolvers still honour (octal, hex, or fewer than four parts, e.g.
+    0177.0.0.1 or 2130706433), and unwraps IPv4-mapped IPv6 addresses.
+
+    Args:
+        host: Hostname from a URL, or an address from DNS resolution
+
+    Returns:
+        The IP address, or None if host is a name
+    """
+    try:
+        ip = ipaddress.ip_address(host)
+    except ValueError:
+        try:
+            return ipaddress.IPv4Address(socket.inet_aton(host))
+        except OSError:
+            return None
+
+    if isinstance(ip, ipaddress.IPv6Address) and ip.ipv4_mapped:
+        return ip.ipv4_mapped
+    return ip
+
+
+def _is_blocked_ip(ip: Optional[ipaddress.IPv4Address | ipaddress.IPv6Address]) -> bool:
+    """
+    Whether an address is internal rather than on the public internet.
+
+    Anything outside the globally routable ranges is blocked, which covers
+    private, loopback, link-local, reserved and shared (100.64.0.0/10,
+    used for cloud metadata) space; multicast is blocked too.
+    """
+    if ip is None:
+        return False
+    if isinstance(ip, ipaddress.IPv6Address) and ip.ipv4_mapped:
+        ip = ip.ipv4_mapped
+    return not ip.is_global or ip.is_multicast
+
+
+@lru_cache(maxsize=1024)
 def validate_url(url: str) -> tuple[bool, Optional[str]]:
     """
     Validate URL for security and format.
 
+    Pure (no DNS lookups), so results are cached per URL.
+
     Args:
         url: URL to validate
 
@@ -56,18 +124,9 @@ def validate_url(url: str) -> tuple[bool, Optional[str]]:
         if hostname and hostname.lower() in BLOCKED_HOSTS:
             return False, "Access to this host is not allowed"
 
-        # Check for private IP ranges (basic check)
-        if hostname:
-            if hostname.startswith("10.") or hostname.startswith("192.168."):
-                return False, "Access to private IP addresses is not allowed"
-            if hostname.startswith("172."):
-                # Check 172.16.0.0 - 172.31.255.255 range
-                try:
-                    second_octet = int(hostname.split(".")[1])
-                    if 16 <= second_octet <= 31:
-                        return False, "Access to private IP addresses is not allowed"
-                except (ValueError, IndexError):
-                    pass
+        # Check for private, loopback, link-local, etc. IP addresses
+        if hostname and _is_blocked_ip(_parse_ip(hostname)):
+            return False, "Access to private IP addresses is not allowed"
 
         return True, None
 
@@ -75,72 +134,289 @@ def validate_url(url: str) -> tuple[bool, Optional[str]]:
         return False, f"Invalid URL format: {str(e)}"
 
 
-async def fetch_page(url: str) -> tuple[Optional[str], Optional[str]]:
+async def _resolves_to_blocked_ip(hostname: str) -> bool:
+    """
+    Resolve a hostname and check every address it maps to.
+
+    Catches public names that point at internal addresses. Names that
+    don't resolve are left for the HTTP client to report.
+
+    Args:
+        hostname: Hostname from a validated URL
+
+    Returns:
+        True if any resolved address is blocked
+    """
+    try:
+        infos = await asyncio.get_running_loop().getaddrinfo(hostname, None)
+    except socket.gaierror:
+        return False
+
+    return any(_is_blocked_ip(_parse_ip(info[4][0])) for info in infos)
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get or create the shared HTTP client used for scraping.
+
+    Returns:
+        httpx.AsyncClient: Client with a keep-alive connection pool
+    """
+    global _http_client
+
+    if _http_client is None:
+        # Redirects are followed by _stream_checked so every hop passes
+        # the SSRF checks
+        _http_client = httpx.AsyncClient(
+            timeout=REQUEST_TIMEOUT,
+            limits=httpx.Limits(max_connections=MAX_CONNECTIONS),
+            headers={"User-Agent": USER_AGENT},
+        )
+
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """
+    Close the shared HTTP client.
+
+    Called during application shutdown to cleanup resources.
+    """
+    global _http_client
+
+    if _http_client is not None:
+        try:
+            await _http_client.aclose()
+            logger.info("Scraper HTTP client closed")
+        except Exception as e:
+            logger.error(f"Error closing scraper HTTP client: {e}")
+        finally:
+            _http_client = None
+
+
+class _BlockedTarget(Exception):
+    """A redirect pointed at a URL that fails the SSRF checks."""
+
+
+async def _check_target(url: str) -> Optional[str]:
+    """
+    Run the SSRF checks on a URL about to be requested.
+
+    Args:
+        url: URL to check
+
+    Returns:
+        Error message if the URL must not be requested, otherwise None
+    """
+    is_valid, error = validate_url(url)
+    if not is_valid:
+        return error
+
+    if await _resolves_to_blocked_ip(urlparse(url).hostname):
+        return "Access to private IP addresses is not allowed"
+
+    return None
+
+
+@asynccontextmanager
+async def _stream_checked(
+    client: httpx.AsyncClient,
+    url: str,
+    headers: Optional[dict[str, str]] = None,
+) -> AsyncIterator[httpx.Response]:
+    """
+    Stream a GET response, following redirects by hand.
+
+    Every redirect target is checked with _check_target before it is
+    requested, so a public page can't bounce the scraper to an internal
+    address. The url itself must already have been checked.
+
+    Args:
+        client: Shared HTTP client
+        url: Validated URL to fetch
+        headers: Extra request headers, sent on every hop
+
+    Yields:
+        The final (non-redirect) streaming response
+
+    Raises:
+        _BlockedTarget: If a redirect target fails the checks, or there
+            are more than MAX_REDIRECTS hops
+    """
+    for _ in range(MAX_REDIRECTS + 1):
+        response = await client.send(
+            client.build_request("GET", url, headers=headers), stream=True
+        )
+        if response.next_request is None:
+            break
+
+        await response.aclose()
+        url = str(response.next_request.url)
+        error = await _check_target(url)
+        if error:
+            raise _BlockedTarget(f"{error} (redirected to {url})")
+    else:
+        raise _BlockedTarget(f"Too many redirects (max {MAX_REDIRECTS})")
+
+    try:
+        yield response
+    finally:
+        await response.aclose()
+
+
+async def _fetch_page(
+    url: str,
+    validators: Optional[dict[str, str]] = None,
+) -> tuple[Optional[str], Optional[str], Optional[dict[str, str]]]:
     """
     Fetch HTML content from URL with security measures.
 
     Args:
         url: URL to fetch
+        validators: Conditional request headers (If-None-Match /
+            If-Modified-Since) from an earlier fetch of the same URL
 
     Returns:
-        Tuple of (html_content, error_message)
+        Tuple of (html_content, error_message, validators). html_content
+        and error_message are both None when the server answered 304 Not
+        Modified; validators are the conditional headers for the next
+        fetch, or None if the response had no ETag/Last-Modified.
     """
     # Validate URL first
-    is_valid, error = validate_url(url)
-    if not is_valid:
+    error = await _check_target(url)
+    if error:
         logger.warning(f"URL validation failed: {error} - {url}")
-        return None, error
+        return None, error, None
 
     try:
-        async with httpx.AsyncClient(
-            follow_redirects=True,
-            timeout=REQUEST_TIMEOUT,
-            limits=httpx.Limits(max_connections=10),
-        ) as client:
-            # Add user agent to avoid being blocked
-            headers = {
-                "User-Agent": "Chirp AI Bot/1.0 (+https://github.com/yourusername/chirp-app)"
-            }
+        client = get_http_client()
 
-            response = await client.get(url, headers=headers)
+        # Stream the body so oversized responses are abandoned without
+        # buffering them
+        async with _stream_checked(client, url, validators) as response:
+            # Unchanged since the validators were issued
+            if validators and response.status_code == 304:
+                logger.info(f"{url} not modified")
+                return None, None, validators
 
             # Check response status
             if response.status_code != 200:
                 error_msg = f"HTTP {response.status_code}: {response.reason_phrase}"
                 logger.warning(f"Failed to fetch {url}: {error_msg}")
-                return None, error_msg
-
-            # Check content length
-            content_length = len(response.content)
-            if content_length > MAX_CONTENT_LENGTH:
-                error_msg = f"Response too large: {content_length} bytes (max {MAX_CONTENT_LENGTH})"
-                logger.warning(f"Failed to fetch {url}: {error_msg}")
-                return None, error_msg
+                return None, error_msg, None
 
             # Check content type
             content_type = response.headers.get("content-type", "").lower()
             if "text/html" not in content_type:
                 error_msg = f"Unsupported content type: {content_type}"
                 logger.warning(f"Failed to fetch {url}: {error_msg}")
-                return None, error_msg
-
+                return None, error_msg, None
+
+            # Check declared length before reading anything
+            declared_length = response.headers.get("content-length", "")
+            if declared_length.isdigit() and int(declared_length) > MAX_CONTENT_LENGTH:
+                error_msg = (
+                    f"Response too large: {declared_length} bytes "
+                    f"(max {MAX_CONTENT_LENGTH})"
+                )
+                logger.warning(f"Failed to fetch {url}: {error_msg}")
+                return None, error_msg, None
+
+            # Check content length as the body arrives
+            body = bytearray()
+            async for chunk in response.aiter_bytes():
+                body += chunk
+                if len(body) > MAX_CONTENT_LENGTH:
+                    error_msg = f"Response too large: over {MAX_CONTENT_LENGTH} bytes"
+                    logger.warning(f"Failed to fetch {url}: {error_msg}")
+                    return None, error_msg, None
+
+            content_length = len(body)
             logger.info(f"Successfully fetched {url} ({content_length} bytes)")
-            return response.text, None
+            html = body.decode(response.encoding or "utf-8", errors="replace")
+
+            new_validators = {}
+            if etag := response.headers.get("etag"):
+                new_validators["If-None-Match"] = etag
+            if last_modified := response.headers.get("last-modified"):
+                new_validators["If-Modified-Since"] = last_modified
+
+            return html, None, new_validators or None
+
+    except _BlockedTarget as e:
+        error_msg = str(e)
+        logger.warning(f"URL validation failed: {error_msg} - {url}")
+        return None, error_msg, None
 
     except httpx.TimeoutException:
         error_msg = f"Request timed out after {REQUEST_TIMEOUT} seconds"
         logger.warning(f"Failed to fetch {url}: {error_msg}")
-        return None, error_msg
+        return None, error_msg, None
 
     except httpx.ConnectError as e:
         error_msg = f"Connection failed: {str(e)}"
         logger.warning(f"Failed to fetch {url}: {error_msg}")
-        return None, error_msg
+        return None, error_msg, None
 
     except Exception as e:
         error_msg = f"Unexpected error: {str(e)}"
         logger.error(f"Failed to fetch {url}: {error_msg}")
-        return None, error_msg
+        return None, error_msg, None
+
+
+async def fetch_page(url: str) -> tuple[Optional[str], Optional[str]]:
+    """
+    Fetch HTML content from URL with security measures.
+
+    Args:
+        url: URL to fetch
+
+    Returns:
+        Tuple of (html_content, error_message)
+    """
+    html, error, _ = await _fetch_page(url)
+    return html, error
+
+
+@lru_cache(maxsize=1)
+def _load_lexbor() -> Optional[ModuleType]:
+    """
+    Import selectolax's lexbor parser once, returning None if unavailable.
+
+    Returns:
+        The selectolax.lexbor module, or None to fall back to BeautifulSoup
+    """
+    try:
+        from selectolax import lexbor
+    except ImportError as e:
+        logger.info(f"selectolax unavailable ({e}), parsing HTML with BeautifulSoup")
+        return None
+    return lexbor
+
+
+def _html_to_text(html: str) -> str:
+    """
+    Get the text of an HTML document without its SKIP_TAGS elements.
+
+    Uses the C lexbor parser when installed, otherwise BeautifulSoup's
+    pure-Python html.parser; both give the same text.
+
+    Args:
+        html: HTML content
+
+    Returns:
+        Text nodes joined with spaces
+    """
+    lexbor = _load_lexbor()
+    if lexbor is not None:
+        tree = lexbor.LexborHTMLParser(html)
+        tree.strip_tags(SKIP_TAGS)
+        return tree.root.text(separator=" ", strip=True) if tree.root else ""
+
+    soup = BeautifulSoup(html, "html.parser")
+    for element in soup(SKIP_TAGS):
+        element.decompose()
+    return soup.get_text(separator=" ", strip=True)
 
 
 def extract_text(html: str) -> str:
@@ -150,6 +426,8 @@ def extract_text(html: str) -> str:
     Removes scripts, styles, navigation, and other non-content elements.
     Limits output to MAX_WORDS to prevent resource abuse.
 
+    Blocking (CPU-bound parsing); run via asyncio.to_thread.
+
     Args:
         html: HTML content
 
@@ -157,25 +435,20 @@ def extract_text(html: str) -> str:
         Cleaned text content
     """
     try:
-        soup = BeautifulSoup(html, "html.parser")
+        # Get text without unwanted elements
+        text = _html_to_text(html)
 
-        # Remove unwanted elements
-        for element in soup(["script", "style", "nav", "header", "footer", "aside"]):
-            element.decompose()
-
-        # Get text
-        text = soup.get_text(separator=" ", strip=True)
-
-        # Clean up whitespace
-        lines = [line.strip() for line in text.splitlines() if line.strip()]
-        text = " ".join(lines)
-
-        # Limit to MAX_WORDS
-        words = text.split()
+        # Limit to MAX_WORDS; the split stops after MAX_WORDS + 1 words, so
+        # huge pages aren't broken into millions of strings
+        words = text.split(None, MAX_WORDS)
         if len(words) > MAX_WORDS:
-            logger.info(f"Truncating text from {len(words)} to {MAX_WORDS} words")
-            words = words[:MAX_WORDS]
+            logger.info(f"Truncating text to {MAX_WORDS} words")
+            words.pop()
             text = " ".join(words)
+        else:
+            # Clean up whitespace
+            lines = [line.strip() for line in text.splitlines() if line.strip()]
+            text = " ".join(lines)
 
         logger.info(f"Extracted {len(words)} words from HTML")
         return text
@@ -190,6 +463,8 @@ async def scrape_url(url: str) -> tuple[Optional[str], Optional[str]]:
     Scrape URL and extract clean text content.
 
     High-level function that combines fetching and text extraction.
+    Text is cached per URL with the page's ETag/Last-Modified, so
+    re-scraping an unchanged page costs one 304 response.
 
     Args:
         url: URL to scrape
@@ -199,19 +474,59 @@ async def scrape_url(url: str) -> tuple[Optional[str], Optional[str]]:
     """
     logger.info(f"Scraping URL: {url}")
 
-    # Fetch page
-    html, error = await fetch_page(url)
+    # Fetch page, conditionally if we have its text from an earlier scrape
+    cached = _scrape_cache.get(url)
+    html, error, validators = await _fetch_page(url, cached[0] if cached else None)
     if error:
         return None, error
 
+    if html is None and cached is not None:
+        # 304 Not Modified: reuse the text extracted last time
+        _scrape_cache.move_to_end(url)
+        logger.info(f"Reusing cached text for {url}: {len(cached[1])} characters")
+        return cached[1], None
+
     if not html:
         return None, "No content received"
 
-    # Extract text
-    text = extract_text(html)
+    # Extract text off the event loop: large pages take tens of ms to parse
+    text = await asyncio.to_thread(extract_text, html)
 
     if not text:
         return None, "No text content could be extracted from page"
 
+    if validators:
+        _scrape_cache[url] = (validators, text)
+        _scrape_cache.move_to_end(url)
+        while len(_scrape_cache) > SCRAPE_CACHE_MAX_SIZE:
+            _scrape_cache.popitem(last=False)
+
     logger.info(f"Successfully scraped {url}: {len(text)} characters")
     return text, None
+
+
+async def scrape_urls(
+    urls: list[str],
+    max_concurrent: int = MAX_CONNECTIONS,
+) -> list[tuple[str, Optional[str], Optional[str]]]:
+    """
+    Scrape several URLs concurrently.
+
+    At most max_concurrent scrapes run at once; by default that matches
+    the shared client's connection pool.
+
+    Args:
+        urls: URLs to scrape
+        max_concurrent: Maximum number of scrapes in flight
+
+    Returns:
+        List of (url, text_content, error_message) tuples in input order
+    """
+    semaphore = asyncio.Semaphore(max_concurrent)
+
+    async def scrape_one(url: str) -> tuple[str, Optional[str], Optional[str]]:
+        async with semaphore:
+            text, error = await scrape_url(url)
+        return url, text, error
+
+    return await asyncio.gather(*(scrape_one(url) for url in urls))
@@ -0,0 +1,82 @@
+"""
+Buffered bot message counters.
+
+Chat requests record messages in memory; a background task flushes the
+totals with one atomic `message_count = message_count + delta` UPDATE
+per bot. This avoids a read-modify-write of the bot row after every
+streamed response and can't lose increments under concurrent requests.
+"""
+
+import asyncio
+import logging
+from collections import defaultdict
+
+from sqlalchemy import update
+
+from app.database import AsyncSessionLocal
+from app.dependencies import invalidate_bot_cache
+from app.models import Bot
+
+logger = logging.getLogger(__name__)
+
+FLUSH_INTERVAL = 5.0  # seconds
+
+# bot_id -> messages not yet written to bots.message_count
+_pending: defaultdict[str, int] = defaultdict(int)
+
+
+def record_message(bot_id: str) -> None:
+    """Count one completed chat message for a bot."""
+    _pending[bot_id] += 1
+
+
+def pending_message_count(bot_id: str) -> int:
+    """Messages recorded for a bot but not yet flushed to the database."""
+    return _pending.get(bot_id, 0)
+
+
+async def flush_message_counts() -> None:
+    """
+    Write pending message counts to the database.
+
+    Counts that fail to write are kept for the next flush.
+    """
+    if not _pending:
+        return
+
+    # Snapshot and reset before awaiting so new increments aren't lost
+    pending = dict(_pending)
+    _pending.clear()
+
+    try:
+        async with AsyncSessionLocal() as session, session.begin():
+            for bot_id, delta in pending.items():
+                await session.execute(
+                    update(Bot)
+                    .where(Bot.id == bot_id)
+                    .values(message_count=Bot.message_count + delta)
+                )
+    except BaseException as e:
+        # Rolled back (error or cancellation): keep the counts for next time
+        for bot_id, delta in pending.items():
+            _pending[bot_id] += delta
+        if not isinstance(e, Exception):
+            raise
+        logger.error(f"Failed to flush message counts: {e}")
+        return
+
+    # Cached bots carry message_count, which no longer includes the
+    # flushed (now zeroed) pending counts
+    invalidate_bot_cache()
+
+
+async def run_flusher() -> None:
+    """
+    Flush message counts every FLUSH_INTERVAL seconds.
+
+    Runs until cancelled; started from the app lifespan, which also does
+    a final flush on shutdown.
+    """
+    while True:
+        await asyncio.sleep(FLUSH_INTERVAL)
+        await flush_message_counts()